@@ -1,5 +1,5 @@
 '''
-This script uses the Python library, BeautifulSoup to scrape data
+This script uses the pandas function, read_html, to scrape data
 from the following Wikipedia pages, and to save the resulting
 data to a csv file.
 - "List of national lakeshores and seashores of the United States"
@@ -10,7 +10,7 @@ data to a csv file.
 
 Required Libraries
 ------------------
-BeautifulSoup, pandas, datetime
+pandas, lxml
 
 Dependencies
 ------------
@@ -36,15 +36,25 @@ Dependencies
    of the project.
 '''
 
-from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def read_tables(filename):
+    '''
+    Parse every table in a saved Wikipedia page. Results are cached
+    per file, so a page shared by several extractors, or read again in
+    the same session, is only parsed once. Callers must not modify the
+    returned tables in place.
+    '''
+
+    return pd.read_html(filename, flavor='lxml')
 
 '''
-The following functions use the Python library, BeautifulSoup, to
-extract the park name and date established from a Wikipeida page saved
-as an html file. The extracted items are added to a dataframe which is
-returned to the calling fuction.
+The following functions use the pandas function, read_html, to extract
+the park name and date established from the tables of a Wikipedia page
+saved as an html file. The extracted items are added to a dataframe
+which is returned to the calling fuction.
 
 Parameters
 ----------
@@ -58,33 +68,23 @@ df : pandas DataFrame
 '''
 
 def get_nlns_established_date(filename):
-    soup = BeautifulSoup(open(filename), 'html.parser')
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
-    table_rows = (soup.find_all('table')[1].find_all('tr')[1:] +
-                  soup.find_all('table')[2].find_all('tr')[1:])
-    for row in table_rows:
-        name = row.find_all('th')[0].text.rstrip()
-        date = pd.to_datetime(row.find_all('td')[2].text)
-        df = df.append({'park_name': name,
-                        'date_established': date
-                       },
-                       ignore_index=True)
+    tables = read_tables(filename)
+
+    # Lakeshores and seashores are listed in two separate tables.
+    df = pd.concat([tables[1], tables[2]], ignore_index=True).iloc[:, [0, 3]]
+    df.columns = ['park_name', 'date_established']
+    df['date_established'] = pd.to_datetime(
+        df['date_established'].str.split('[').str[0], errors='coerce')
 
     return df
 
 def get_nmem_established_date(filename):
-    soup = BeautifulSoup(open(filename), 'html.parser')
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
-    table_rows = soup.find_all('table')[1].find_all('tr')[1:]
-    for row in table_rows:
-        name = row.find_all('th')[0].text.rstrip()
-        date = pd.to_datetime(row.find_all('td')[2].text)
-        df = df.append({'park_name': name,
-                        'date_established': date
-                       },
-                       ignore_index=True)
+    tables = read_tables(filename)
+
+    df = tables[1].iloc[:, [0, 3]]
+    df.columns = ['park_name', 'date_established']
+    df['date_established'] = pd.to_datetime(
+        df['date_established'].str.split('[').str[0], errors='coerce')
 
     return df
 
@@ -94,61 +94,46 @@ def get_nm_established_date(filename):
     Evers Home, and Mill Springs Battlefield. They are recent sites with
     status - "Pending acquisition of property".'''
 
-    soup = BeautifulSoup(open(filename), 'html.parser')
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
-    table_rows = soup.find_all('table')[2].find_all('tr')[1:]
-    for row in table_rows:
-        row_cells = row.find_all('td')
-        name = row_cells[0].text.rstrip()
-        agency = row_cells[2].text.rstrip()
-        date = pd.to_datetime(row_cells[4].span.text)
-        # Only add site to df if agency is the NPS.
-        if agency.find('NPS') == 0:
-            df = df.append({'park_name': name,
-                            'date_established': date
-                           },
-                           ignore_index=True)
+    tables = read_tables(filename)
 
-    return df
+    # Only keep sites where the agency is the NPS.
+    df = tables[2]
+    df = df[df.iloc[:, 2].str.startswith('NPS', na=False)].iloc[:, [0, 4]]
+    df.columns = ['park_name', 'date_established']
+
+    # The date cell can contain more than one date, use the first.
+    df['date_established'] = pd.to_datetime(
+        df['date_established'].str.extract(r'(\w+ \d{1,2}, \d{4})')[0],
+        errors='coerce')
+
+    return df.reset_index(drop=True)
 
 def get_np_established_date(filename):
-    soup = BeautifulSoup(open(filename), 'html.parser')
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
-    table_rows = soup.find_all('table')[1].find_all('tr')[1:]
-
-    # For each row in the table, extract the name of the park, and
-    # the date established and add to the dataframe.
-    for row in table_rows:
-        name = row.find_all(['th','td'])[0].text.replace('*','').rstrip()
-        date = pd.to_datetime(
-                   row.find_all(['th', 'td'])[3].text.rstrip().split('[')[0])
-        df = df.append({'park_name': name,
-                        'date_established': date
-                       },
-                       ignore_index=True)
+    tables = read_tables(filename)
+
+    df = tables[1].iloc[:, [0, 3]]
+    df.columns = ['park_name', 'date_established']
+    df['park_name'] = df['park_name'].str.replace('*', '', regex=False)
+
+    # Every park date is written as "Month DD, YYYY", so skip format
+    # inference.
+    df['date_established'] = pd.to_datetime(
+        df['date_established'].str.split('[').str[0].str.strip(),
+        format='%B %d, %Y', errors='coerce')
 
     return df
 
 def get_npkwy_established_date(filename):
-    soup = BeautifulSoup(open(filename), 'html.parser')
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
-    table_rows = soup.find_all('table')[1].find_all('tr')[1:]
-    for row in table_rows:
-        name = row.find_all('th')[0].text.rstrip()
-        date = pd.to_datetime(row.find_all('td')[4].text)
-        df = df.append({'park_name': name,
-                        'date_established': date
-                       },
-                       ignore_index=True)
+    tables = read_tables(filename)
+
+    df = tables[1].iloc[:, [0, 5]]
+    df.columns = ['park_name', 'date_established']
+    df['date_established'] = pd.to_datetime(
+        df['date_established'].str.split('[').str[0], errors='coerce')
 
     return df
 
 def main():
-    df = pd.DataFrame(columns=['park_name', 'date_established'])
-
     # National Battlefields
     # National Battlefield Parks
     # National Battlefield Sites
@@ -157,25 +142,27 @@ def main():
     # National Historic Sites
     # International Historic Sites
 
+    frames = []
+
     # National Lakeshores and Seashores
     infile = '_reference_data/wikipedia_national_lakeshores_and_seashores.html'
-    df = df.append(get_nlns_established_date(infile), ignore_index=True)
+    frames.append(get_nlns_established_date(infile))
 
     # National Memorials
     infile = '_reference_data/wikipedia_national_memorials.html'
-    df = df.append(get_nmem_established_date(infile), ignore_index=True)
+    frames.append(get_nmem_established_date(infile))
 
     # National Monuments
     infile = '_reference_data/wikipedia_national_monuments.html'
-    df = df.append(get_nm_established_date(infile), ignore_index=True)
+    frames.append(get_nm_established_date(infile))
 
     # National Parks
     infile = '_reference_data/wikipedia_national_parks.html'
-    df = df.append(get_np_established_date(infile), ignore_index=True)
+    frames.append(get_np_established_date(infile))
 
     # National Parkways
     infile = '_reference_data/wikipedia_national_parkways.html'
-    df = df.append(get_npkwy_established_date(infile), ignore_index=True)
+    frames.append(get_npkwy_established_date(infile))
 
     # National Preserves
     # National Reserves
@@ -185,7 +172,7 @@ def main():
     # National Scenic Trails
     # Other Designations
 
-    print(df)
+    df = pd.concat(frames, ignore_index=True)
 
     df.to_csv('_reference_data/wikipedia_date_established.csv', index=False)
 
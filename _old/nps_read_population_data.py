@@ -1,23 +1,30 @@
 import os
 import sys
-import urllib.request, urllib.parse
-import json
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 # Retrieve the census api key from the config file, nps_config.py,
 # stored in the root directory.
 sys.path.append(os.path.expanduser('~'))
 from nps_config import *
 
+# Share one keep-alive session across all census API requests so the
+# TLS connection is reused instead of reopened for every year.
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def get_api_data(url):
     '''
     Read data returned by a url rquest.
 
-    This function opens the url, reads the data returned by the url,
-    and decodes the bytes object to string. It then converts the json
-    document to a python dictionary. The function also prints the api
-    request limit and remaining requests for the user.
+    This function requests the url through the shared session and
+    converts the returned json document to a python dictionary. The
+    function also prints the api request limit and remaining requests
+    for the user.
 
     Parameters
     ----------
@@ -32,12 +39,11 @@ def get_api_data(url):
 
     print('')
     print('Retrieving', url)
-    connection = urllib.request.urlopen(url)
-    data = connection.read().decode()
-    headers = dict(connection.getheaders())
+    response = session.get(url, timeout=30)
+    headers = response.headers
 
     try:
-        js = json.loads(data)
+        js = response.json()
     except:
         js = None
     if not js:
@@ -139,10 +145,9 @@ def get_2010_2017_data(state_fips_dict):
 
     domain = 'https://api.census.gov'
 
-    df = pd.DataFrame(columns=['year', 'state', 'population'])
     years = list(map(lambda x: str(x), range(2010, 2018)))
 
-    for year in years:
+    def fetch_year(year):
         path = '/data/' + year + '/acs/acs1?'
         domain_path = domain + path
         url = domain_path + urllib.parse.urlencode({'get': 'B01003_001E',
@@ -152,9 +157,16 @@ def get_2010_2017_data(state_fips_dict):
         year_df = pd.DataFrame(columns=['population', 'state'],
                                data=js[1:])
 
-        year_df['state'].replace(state_fips_dict, inplace=True)
+        year_df['state'] = year_df['state'].map(state_fips_dict)
         year_df['year'] = year
-        df = df.append(year_df, ignore_index=True, sort=True)
+
+        return year_df
+
+    # Requests are I/O bound, so fetch all years concurrently.
+    with ThreadPoolExecutor(max_workers=len(years)) as executor:
+        year_dfs = list(executor.map(fetch_year, years))
+
+    df = pd.concat(year_dfs, ignore_index=True, sort=True)
 
     return(df[['year', 'state', 'population']])
 
@@ -163,32 +175,24 @@ def get_fips_state_codes():
                        header=0)
     df.dropna(axis=0, inplace=True)
     df = df[['state_alpha_code', 'state_fips_code']]
-    df['state_fips_code'] = df['state_fips_code'].apply(str).str.rjust(2,'0')
-    d = dict([(f, a) for f, a in zip(df.state_fips_code, df.state_alpha_code)])
+    df['state_fips_code'] = (df['state_fips_code']
+                             .astype(int).astype(str).str.zfill(2))
+    d = dict(zip(df.state_fips_code, df.state_alpha_code))
 
     return d
 
 def main():
     state_fips_dict = get_fips_state_codes()
-    pop_df = pd.DataFrame(columns=['year', 'state', 'population'])
-
-    decade_df = read_1970_1979_data()
-    pop_df = pop_df.append(decade_df, ignore_index=True, sort=True)
-
-    decade_df = read_1980_1989_data()
-    pop_df = pop_df.append(decade_df, ignore_index=True, sort=True)
-
-    decade_df = read_1990_2000_data()
-    pop_df = pop_df.append(decade_df, ignore_index=True, sort=True)
-
-    decade_df = read_2000_2010_data()
-    pop_df = pop_df.append(decade_df, ignore_index=True, sort=True)
 
-    decade_df = get_2010_2017_data(state_fips_dict)
-    pop_df = pop_df.append(decade_df, ignore_index=True, sort=True)
+    pop_df = pd.concat([read_1970_1979_data(),
+                        read_1980_1989_data(),
+                        read_1990_2000_data(),
+                        read_2000_2010_data(),
+                        get_2010_2017_data(state_fips_dict)],
+                       ignore_index=True, sort=True)
 
     (pop_df[['year', 'state','population']]
-           .to_excel('_census_data/us_est_1970-2017.xlsx', index=False))
+           .to_csv('_census_data/us_est_1970-2017.csv', index=False))
 
 if __name__ == '__main__':
     main()
@@ -19,7 +19,7 @@ only with the 419 official units.
 
 Required Libraries
 ------------------
-pandas, SequenceMatcher, nps_shared
+pandas, pyarrow, xlsxwriter, SequenceMatcher, nps_shared
 
 Dependencies
 ------------
@@ -34,7 +34,8 @@ Dependencies
    Year Reports, Year = 2018. Place this file in the '_acreage_data'
    directory of this project.
 5) Run the script, nps_read_visitor_data.py to create the file:
-   annual_visitors_by_park_1904_2018.xlsx.
+   annual_visitors_by_park_1904_2018.parquet. If it is missing, the
+   included file, annual_visitors_by_park_1904_2018.xlsx, is read.
 '''
 
 import pandas as pd
@@ -476,8 +477,18 @@ def read_visitor_data(df_master):
         Dataframe of park code and visits per year.
     '''
 
-    filename = '_reference_data/annual_visitors_by_park_1904_2018.xlsx'
-    df = pd.read_excel(filename)
+    # Use the Parquet file written by nps_read_visitor_data.py if it
+    # exists. Otherwise, read the Excel copy included in the repository.
+    filename = Path('_reference_data/'
+                    'annual_visitors_by_park_1904_2018.parquet')
+    if filename.exists():
+        df = pd.read_parquet(filename, engine='pyarrow')
+
+        # Year columns are stored as text in the parquet file.
+        df = df.rename(columns=lambda x: int(x) if x.isdigit() else x)
+    else:
+        df = pd.read_excel(filename.with_suffix('.xlsx'),
+                           engine=excel_engine)
 
     # Exclude certain parks not in the list of 419.
     exclude_list = ["John F. Kennedy Center For Pa", "National Visitor Center",
@@ -648,9 +659,14 @@ def main():
     # Add the budget data to the master df.
     #df_budget = read_budget_data(df_master)
 
-    # Sort and save the master dataframe to an Excel file.
+    # Sort and save the master dataframe to an Excel file. xlsxwriter
+    # is much faster than openpyxl at writing a workbook this wide.
     df_master = df_master.sort_values(by=['park_name']).reset_index(drop=True)
-    df_master.to_excel('nps_parks_master_df.xlsx')
+    df_master.to_excel('nps_parks_master_df.xlsx', engine='xlsxwriter')
+
+    # Build the Parquet copy of the master now, so the visualization
+    # scripts never have to parse the Excel file themselves.
+    load_master_df()
 
 if __name__ == '__main__':
     main()
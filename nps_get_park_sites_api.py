@@ -4,7 +4,7 @@ saves it as the Excel file, nps_park_sites_api.xlsx.
 
 Required Libraries
 ------------------
-os, sys, urllib, json, pandas
+os, sys, urllib, json, pandas, orjson (optional, faster json parsing)
 
 Dependencies
 ------------
@@ -16,9 +16,15 @@ Dependencies
 import os
 import sys
 import urllib.request, urllib.parse
-import json
 import pandas as pd
 
+# Use orjson to parse the API response if it is installed, otherwise
+# fall back to the standard library json module.
+try:
+    import orjson as json
+except ImportError:
+    import json
+
 # Retrieve the nps api key from the config file, nps_config.py, stored
 # in the root directory.
 sys.path.append(os.path.expanduser('~'))
@@ -27,9 +33,9 @@ from nps_config import *
 def get_api_data(url):
     '''
     This function opens the url, reads the data returned by the url,
-    and decodes the bytes object to string. It then converts the json
-    document to a python dictionary. The function also prints the api
-    request limit and remaining requests for the user.
+    and converts the json document to a python dictionary. The
+    function also prints the api request limit and remaining requests
+    for the user.
 
     Parameters
     ----------
@@ -45,13 +51,14 @@ def get_api_data(url):
     print('')
     print('Retrieving', url)
     connection = urllib.request.urlopen(url)
-    data = connection.read().decode()
     headers = dict(connection.getheaders())
     print('24-hour Request Limit: ', headers['X-RateLimit-Limit'])
     print('Requests Remaining: ', headers['X-RateLimit-Remaining'])
 
+    # Parse the response body as bytes, straight from the connection,
+    # without decoding it to an intermediate string first.
     try:
-        js = json.loads(data)
+        js = json.loads(connection.read())
     except:
         js = None
     if not js:
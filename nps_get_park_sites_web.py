@@ -7,7 +7,7 @@ as an Excel file, 'nps_park_sites_web.xlsx'.
 
 Required Libraries
 ------------------
-pandas, BeautifulSoup
+pandas, BeautifulSoup, lxml
 
 Dependencies
 ------------
@@ -17,9 +17,16 @@ Dependencies
    project.
 '''
 
+from pathlib import Path
 from bs4 import BeautifulSoup
 import pandas as pd
 
+# "Related Areas" are also listed on this web page. Ignore these.
+ignore_designations = frozenset({
+    "Affiliated Areas", "Authorized Areas", "Commemorative Sites",
+    "National Heritage Areas", "National Trails System",
+    "National Wild & Scenic Rivers System"})
+
 def get_park_sites_from_page(filename):
     '''
     This function uses the BeautifulSoup library to extract each park
@@ -37,32 +44,35 @@ def get_park_sites_from_page(filename):
         Dataframe of park names and designations.
     '''
 
-    soup = BeautifulSoup(open(filename), 'html.parser')
+    soup = BeautifulSoup(Path(filename).read_bytes(), 'lxml')
 
-    df = pd.DataFrame(columns=['park_name', 'designation'])
+    rows = []
 
     # Pretty print html.
     #prettyHTML = soup.prettify()
     #print(prettyHTML)
 
-    # "Related Areas" are also listed on this web page. Ignore these.
-    ignore_list = ["Affiliated Areas", "Authorized Areas",
-                   "Commemorative Sites", "National Heritage Areas",
-                   "National Trails System",
-                   "National Wild & Scenic Rivers System"]
-
     # Use BeautifulSoup to parse the html tree and extract the park
-    # names and designations.
-    for link in soup.select('.collapsible-item-title-link'):
+    # names and designations. Each designation is a collapsible item
+    # with the designation in the title link and the list of parks in
+    # the item body.
+    for item in soup.select('.collapsible-item'):
+        link = item.select_one('.collapsible-item-title-link')
+        body = item.select_one('.collapsible-item-body')
+        if link is None or body is None:
+            continue
         designation = link.text.split('(')[0].strip()
-        if designation not in ignore_list:
-            parks = (link.parent.parent.next_sibling.next_sibling.text
-                     .split('\n'))
-            for park in parks:
-                if park:
-                    df = df.append({'park_name': park.split(',')[0].strip(),
-                                    'designation': designation},
-                                    ignore_index=True)
+        if designation in ignore_designations:
+            continue
+
+        # One park per line, formatted as "park name, state(s)".
+        parks = pd.Series(body.text.splitlines()).str.strip()
+        parks = parks[parks.astype(bool)]
+        parks = parks.str.split(',', n=1).str[0].str.strip()
+        rows.extend({'park_name': park, 'designation': designation}
+                    for park in parks)
+
+    df = pd.DataFrame(rows, columns=['park_name', 'designation'])
 
     return df
 
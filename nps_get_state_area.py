@@ -7,7 +7,7 @@ in sqaure miles. This list is saved as a csv file,
 
 Required Libraries
 ------------------
-pandas, BeautifulSoup, nps_shared
+pandas, BeautifulSoup, lxml, nps_shared
 
 Dependencies
 ------------
@@ -18,6 +18,7 @@ Dependencies
 '''
 
 import pandas as pd
+from pathlib import Path
 from bs4 import BeautifulSoup
 from nps_shared import *
 
@@ -40,23 +41,24 @@ def get_state_area(filename):
         Dataframe of state name, state code, and area in square miles.
     '''
 
-    soup = BeautifulSoup(open(filename), 'html.parser')
+    soup = BeautifulSoup(Path(filename).read_bytes(), 'lxml')
 
-    df = pd.DataFrame(columns=['state_name', 'state_code', 'area_square_miles'])
+    rows = []
 
     table_rows = soup.find_all('tbody')[0].find_all('tr')
     for row in table_rows[6:]:
         table_cells = row.find_all('td')
         state_name = table_cells[0].text
         if len(state_name) > 0  and not state_name.startswith("Island Areas"):
-            state_name = table_cells[0].text
             area = float(table_cells[1].text.replace(',',''))
-            df = df.append({'state_name': state_name,
-                            'state_code': state_name,
-                            'area_square_miles': area},
-                            ignore_index = True)
+            rows.append({'state_name': state_name,
+                         'state_code': state_name,
+                         'area_square_miles': area})
 
-    df.state_code = df.state_code.replace(us_state_name_to_code)
+    df = pd.DataFrame(rows, columns=['state_name', 'state_code',
+                                     'area_square_miles'])
+    df.state_code = (df.state_code.map(us_state_name_to_code)
+                     .fillna(df.state_code))
     df['area_acres'] = df.area_square_miles * 640
 
     return df
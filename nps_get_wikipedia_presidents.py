@@ -1,11 +1,11 @@
 '''
-This script uses the Python library, BeautifulSoup to scrape data
+This script uses the Python library, lxml, to scrape data
 from the Wikipedia page, "List of Presidents of the United States", and
 to save the resulting dataframe to a csv files.
 
 Required Libraries
 ------------------
-BeautifulSoup, pandas, datetime
+lxml, pandas
 
 Dependencies
 ------------
@@ -15,9 +15,13 @@ Dependencies
    of the project.
 '''
 
-from bs4 import BeautifulSoup
+import re
+from pathlib import Path
+import lxml.html
 import pandas as pd
-from datetime import datetime
+
+# Date text ends at the first footnote "[" or note "(".
+trim_re = re.compile(r'[\[\(]')
 
 def get_list_of_presidents(filename):
     '''
@@ -35,37 +39,49 @@ def get_list_of_presidents(filename):
         Dataframe of park name and date established.
     '''
 
-    soup = BeautifulSoup(open(filename), 'html.parser')
+    tree = lxml.html.document_fromstring(Path(filename).read_bytes())
 
-    df = pd.DataFrame(columns=['president', 'start_date', 'end_date'])
+    rows = []
 
-    # Find the table of National Parks.
-    table_rows = soup.find_all('table')[1].find_all('tr')
-    for row in table_rows[2:]:
-        table_cells = row.find_all('td')
+    # Find the table of presidents, skipping the two header rows.
+    table_rows = tree.xpath('((//table)[2]//tr)[position() > 2]')
+    for row in table_rows:
+        table_cells = row.xpath('.//td')
         if len(table_cells) > 3:
-            name = table_cells[3].a.text
-            dates = table_cells[1].find_all('span')
+            name = table_cells[3].xpath('.//a')[0].text_content()
+            date_cell = table_cells[1]
+            dates = date_cell.xpath('.//span')
             if len(dates) > 0:
-              start_date = dates[0].text.split('[')[0]
+              start_date = trim_re.split(dates[0].text_content(), 1)[0]
               if len(dates) > 1:
-                  end_date = dates[1].text
+                  end_date = dates[1].text_content()
               else:
-                  end_date = datetime.strptime(start_date, '%B %d, %Y')
-                  end_date = end_date.replace(year = end_date.year + 4)
+                  # Current president, end date is filled in below.
+                  end_date = None
             else:
-                dates = table_cells[1].text.split('–')
+                dates = date_cell.text_content().split('–')
                 start_date = dates[0]
-                end_date = dates[1].split('(')[0]
+                end_date = trim_re.split(dates[1], 1)[0]
+
+            rows.append({'president': name,
+                         'start_date': start_date,
+                         'end_date': end_date
+                        })
+
+    df = pd.DataFrame(rows, columns=['president', 'start_date', 'end_date'])
 
-            df = df.append({'president': name,
-                            'start_date': start_date,
-                            'end_date': end_date
-                           },
-                           ignore_index=True)
+    # Dates are all written as "Month DD, YYYY", so parse them with an
+    # explicit format rather than letting pandas infer it per value.
+    # A date in any other format raises.
+    for col in ['start_date', 'end_date']:
+        df[col] = pd.to_datetime(df[col].str.strip(), format='%B %d, %Y')
 
-    df['start_date'] = pd.to_datetime(df['start_date'])
-    df['end_date'] = pd.to_datetime(df['end_date'])
+    # The current president, in the last row, has no end date yet, so
+    # assume the term ends four years after it started.
+    last = df.index[-1]
+    if pd.isnull(df.at[last, 'end_date']):
+        df.at[last, 'end_date'] = (df.at[last, 'start_date']
+                                   + pd.DateOffset(years=4))
 
     return df
 
@@ -2,14 +2,16 @@
 ### THIS SCRIPT NEEDS DOCUMENTATION ###
 '''
 
+import io
 import os
 import sys
 import urllib.request, urllib.parse
 import json
 import pandas as pd
 import numpy as np
-import itertools
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from nps_shared import *
 
 # Retrieve the census api key from the config file, nps_config.py,
@@ -59,8 +61,10 @@ def read_2000_2009_data():
 
     col_names = ['state', 2000,2001,2002,2003,2004,2005,2006,2007,2008,2009]
     df = pd.read_excel('_census_data/st-est_2000-2010.xlsx', header=None,
-                       skiprows=9, nrows=51, usecols='A,C:L', names=col_names)
-    df.state = df.state.str.replace('.', '')
+                       skiprows=9, nrows=51, usecols='A,C:L', names=col_names,
+                       engine=excel_engine)
+    df.state = (df.state.astype('string[pyarrow]')
+                  .str.replace('.', '', regex=False))
     df = pd.melt(df, id_vars=['state'], value_vars=col_names[1:],
                  var_name='year', value_name='population')
 
@@ -77,18 +81,28 @@ def read_1990_1999_data():
     then performed the data cleanup tasks below to get the data into
     the correct format.
     '''
-    df = pd.read_csv('_census_data/co-est2001-12-00.csv',
-                     skiprows=6, skipfooter=4, usecols=[0,2,3,4,5],
+    filename = '_census_data/co-est2001-12-00.csv'
+
+    # Count the lines up front so the four footer lines can be dropped
+    # with nrows, which the C parser supports, rather than skipfooter,
+    # which needs the slower python engine.
+    with open(filename, 'rb') as f:
+        line_count = sum(1 for _ in f)
+    df = pd.read_csv(filename,
+                     skiprows=6, nrows=line_count - 6 - 4,
+                     usecols=[0,2,3,4,5],
                      names=['state', 1990, 'combined', 1998, 1999],
-                     engine='python')
+                     engine='c')
     df = df[df.state != 'Geography']
     df = df.dropna(axis=0).reset_index(drop=True)
-    df = pd.concat([df[['state', 1990]],
-                    df['combined'].str.split(' ', expand=True),
-                    df[[1998, 1999]]],
-                    axis=1)
-    df = df.rename(columns = {0: 1991, 1: 1992, 2: 1993, 3: 1994,
-                              4: 1995, 5: 1996, 6: 1997})
+
+    # The 1991-1997 estimates share one space-separated cell. Split them
+    # with the Arrow string kernels.
+    df_combined = (df['combined'].astype('string[pyarrow]')
+                   .str.split(' ', expand=True))
+    df_combined.columns = list(range(1991, 1998))
+    df = pd.concat([df[['state', 1990]], df_combined, df[[1998, 1999]]],
+                   axis=1)
 
     df = pd.melt(df, id_vars=['state'], var_name='year',
                      value_name='population')
@@ -98,16 +112,25 @@ def read_1990_1999_data():
 
     return df[['year', 'state', 'population']]
 
+@lru_cache(maxsize=None)
+def read_census_file(file):
+    '''
+    Read a census text file into memory. Each file holds two tables,
+    so caching the bytes means each file is only read from disk once.
+    '''
+
+    return Path(file).read_bytes()
+
 def read_intercensal_table(file, start_line, end_line, col_names, cols):
 
-    with open(file) as f:
-        year_list = []
-        for line in itertools.islice(f, start_line, end_line):
-            line_list = line.rstrip().split(' ')
-            line_list = [x for x in line_list if x]
-            line_list = [line_list[i] for i in cols]
-            year_list.append(line_list)
-        df = pd.DataFrame(columns=col_names, data=year_list)
+    # Tables are whitespace-aligned, so let the C parser split the
+    # columns and convert the comma-separated population counts instead
+    # of tokenizing each line in Python.
+    df = pd.read_csv(io.BytesIO(read_census_file(file)), sep=r'\s+',
+                     engine='c', header=None,
+                     skiprows=start_line, nrows=end_line - start_line,
+                     usecols=cols, thousands=',')
+    df.columns = col_names
 
     return df
 
@@ -136,158 +159,111 @@ def read_1900_1989_data():
     https://www2.census.gov/programs-surveys/popest/tables/1980-1990/state/asrh/st0009ts.txt
     '''
 
-    df_8084 = read_intercensal_table(
-                  '_census_data/st8090ts.txt', 11, 62,
-                  ['state', 1980, 1981, 1982, 1983, 1984],
-                  list(range(0,6)))
-
-    # Read years 1985 - 1989
-    df_8589 = read_intercensal_table(
-                  '_census_data/st8090ts.txt', 70, 121,
-                  ['state', 1985, 1986, 1987, 1988, 1989],
-                  list(range(0,6)))
-
-    # Read years 1970 - 1975
-    df_7075 = read_intercensal_table(
-                  '_census_data/st7080ts.txt', 18, 69,
-                  ['state', 1970, 1971, 1972, 1973, 1974, 1975],
-                  list(range(1,8)))
-
-    # Read years 1976-1979
-    df_7679 = read_intercensal_table(
-                  '_census_data/st7080ts.txt', 71, 122,
-                  ['state', 1976, 1977, 1978, 1979],
-                  list(range(1,6)))
-
-    # Read years 1960 - 1964
-    df_6064 = read_intercensal_table(
-                  '_census_data/st6070ts.txt', 24, 75,
-                  ['state', 1960, 1961, 1962, 1963, 1964],
-                  [0,2,3,4,5,6])
-
-    # Read years 1965-1969
-    df_6569 = read_intercensal_table(
-                  '_census_data/st6070ts.txt', 86, 142,
-                  ['state', 1965, 1966, 1967, 1968, 1969],
-                  list(range(0,6)))
-
-    # Read years 1950 - 1954
-    df_5054 = read_intercensal_table(
-                  '_census_data/st5060ts.txt', 27, 78,
-                  ['state', 1950, 1951, 1952, 1953, 1954],
-                  [0,2,3,4,5,6])
-
-    # Read years 1955 - 1959
-    df_5559 = read_intercensal_table(
-                  '_census_data/st5060ts.txt', 92, 143,
-                  ['state', 1955, 1956, 1957, 1958, 1959],
-                  list(range(0,6)))
-
-    # Read years 1940 - 1945
-    df_4045 = read_intercensal_table(
-                  '_census_data/st4049ts.txt', 21, 70,
-                  ['state', 1940, 1941, 1942, 1943, 1944, 1945],
-                  list(range(0,7)))
-
-    # Read years 1946 - 1949
-    df_4649 = read_intercensal_table(
-                  '_census_data/st4049ts.txt', 79, 143,
-                  ['state', 1946, 1947, 1948, 1949],
-                  list(range(0,5)))
-
-    # Read years 1930 - 1935
-    df_3035 = read_intercensal_table(
-                  '_census_data/st3039ts.txt', 23, 72,
-                  ['state', 1930, 1931, 1932, 1933, 1934, 1935],
-                  list(range(0,7)))
-
-    # Read years 1936 - 1939
-    df_3639 = read_intercensal_table(
-                  '_census_data/st3039ts.txt', 82, 143,
-                  ['state', 1936, 1937, 1938, 1939],
-                  list(range(0,5)))
-
-    # Read years 1920 - 1925
-    df_2025 = read_intercensal_table(
-                  '_census_data/st2029ts.txt', 23, 72,
-                  ['state', 1920, 1921, 1922, 1923, 1924, 1925],
-                  list(range(0,7)))
-
-    # Read years 1926 - 1929
-    df_2629 = read_intercensal_table(
-                  '_census_data/st2029ts.txt', 81, 143,
-                  ['state', 1926, 1927, 1928, 1929],
-                  list(range(0,5)))
-
-    # Read years 1910 - 1915
-    df_1015 = read_intercensal_table(
-                '_census_data/st1019ts_v2.txt', 23, 72,
-                ['state', 1910, 1911, 1912, 1913, 1914, 1915],
-                list(range(0,7)))
-
-    # Read years 1916 - 1919
-    df_1619 = read_intercensal_table(
-                '_census_data/st1019ts_v2.txt', 81, 143,
-                ['state', 1916, 1917, 1918, 1919],
-                list(range(0,5)))
-
-    # Read years 1900 - 1905
-    df_0005 = read_intercensal_table(
-                  '_census_data/st0009ts.txt', 23, 72,
-                  ['state', 1900, 1901, 1902, 1903, 1904, 1905],
-                  list(range(0,7)))
-
-    # Read years 1906 - 1909
-    df_0609 = read_intercensal_table(
-                  '_census_data/st0009ts.txt', 81, 143,
-                  ['state', 1906, 1907, 1908, 1909],
-                  list(range(0,5)))
-
-    df_list = [df_8084, df_8589, df_7075, df_7679, df_6064, df_6569, df_5054,
-               df_5559, df_4045, df_4649, df_3035, df_3639, df_2025, df_2629,
-               df_1015, df_1619, df_0005, df_0609]
-
-    df = reduce(lambda a,b: pd.merge(a, b, how='left', on='state'), df_list)
+    # Table location for each range of years: file, first and last line,
+    # column names, and columns to keep.
+    table_specs = [
+        # Read years 1980 - 1984
+        ('_census_data/st8090ts.txt', 11, 62,
+         ['state', 1980, 1981, 1982, 1983, 1984], list(range(0,6))),
+        # Read years 1985 - 1989
+        ('_census_data/st8090ts.txt', 70, 121,
+         ['state', 1985, 1986, 1987, 1988, 1989], list(range(0,6))),
+        # Read years 1970 - 1975
+        ('_census_data/st7080ts.txt', 18, 69,
+         ['state', 1970, 1971, 1972, 1973, 1974, 1975], list(range(1,8))),
+        # Read years 1976-1979
+        ('_census_data/st7080ts.txt', 71, 122,
+         ['state', 1976, 1977, 1978, 1979], list(range(1,6))),
+        # Read years 1960 - 1964
+        ('_census_data/st6070ts.txt', 24, 75,
+         ['state', 1960, 1961, 1962, 1963, 1964], [0,2,3,4,5,6]),
+        # Read years 1965-1969
+        ('_census_data/st6070ts.txt', 86, 142,
+         ['state', 1965, 1966, 1967, 1968, 1969], list(range(0,6))),
+        # Read years 1950 - 1954
+        ('_census_data/st5060ts.txt', 27, 78,
+         ['state', 1950, 1951, 1952, 1953, 1954], [0,2,3,4,5,6]),
+        # Read years 1955 - 1959
+        ('_census_data/st5060ts.txt', 92, 143,
+         ['state', 1955, 1956, 1957, 1958, 1959], list(range(0,6))),
+        # Read years 1940 - 1945
+        ('_census_data/st4049ts.txt', 21, 70,
+         ['state', 1940, 1941, 1942, 1943, 1944, 1945], list(range(0,7))),
+        # Read years 1946 - 1949
+        ('_census_data/st4049ts.txt', 79, 143,
+         ['state', 1946, 1947, 1948, 1949], list(range(0,5))),
+        # Read years 1930 - 1935
+        ('_census_data/st3039ts.txt', 23, 72,
+         ['state', 1930, 1931, 1932, 1933, 1934, 1935], list(range(0,7))),
+        # Read years 1936 - 1939
+        ('_census_data/st3039ts.txt', 82, 143,
+         ['state', 1936, 1937, 1938, 1939], list(range(0,5))),
+        # Read years 1920 - 1925
+        ('_census_data/st2029ts.txt', 23, 72,
+         ['state', 1920, 1921, 1922, 1923, 1924, 1925], list(range(0,7))),
+        # Read years 1926 - 1929
+        ('_census_data/st2029ts.txt', 81, 143,
+         ['state', 1926, 1927, 1928, 1929], list(range(0,5))),
+        # Read years 1910 - 1915
+        ('_census_data/st1019ts_v2.txt', 23, 72,
+         ['state', 1910, 1911, 1912, 1913, 1914, 1915], list(range(0,7))),
+        # Read years 1916 - 1919
+        ('_census_data/st1019ts_v2.txt', 81, 143,
+         ['state', 1916, 1917, 1918, 1919], list(range(0,5))),
+        # Read years 1900 - 1905
+        ('_census_data/st0009ts.txt', 23, 72,
+         ['state', 1900, 1901, 1902, 1903, 1904, 1905], list(range(0,7))),
+        # Read years 1906 - 1909
+        ('_census_data/st0009ts.txt', 81, 143,
+         ['state', 1906, 1907, 1908, 1909], list(range(0,5))),
+    ]
+
+    # The tables are independent, so read them concurrently. The C
+    # parser releases the GIL while tokenizing.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        df_list = list(executor.map(
+            lambda spec: read_intercensal_table(*spec).set_index('state'),
+            table_specs))
+
+    # Align all year ranges on state in a single join. The 1980-1984
+    # table lists every state, so no rows are added compared to a left
+    # merge.
+    df = pd.concat(df_list, axis=1).reset_index()
     df = pd.melt(df, id_vars=['state'], var_name='year',
                  value_name='population')
     df = df.sort_values(by=['year', 'state'])
 
-    df.population = df.population.str.replace(',','')
     df = df.fillna(value=0)
-    df.population = pd.to_numeric(df.population)
-    df.population = np.where(df.year < 1970,
-                             df.population * 1000,
-                             df.population)
-    df.state = df.state.replace(us_state_code_to_name)
+
+    # Counts before 1970 are reported in thousands.
+    population = df.population.to_numpy(dtype=np.int64, copy=True)
+    population[df.year.to_numpy() < 1970] *= 1000
+    df['population'] = population
+
+    # State codes repeat for every year, so rename the 51 categories
+    # instead of looking up each row.
+    df.state = (df.state.astype('category')
+                  .cat.rename_categories(us_state_code_to_name))
 
     return df[['year', 'state', 'population']]
 
 def main():
     #state_fips_dict = get_fips_state_codes()
-    df_pop = pd.DataFrame(columns=['year', 'state', 'population'])
-
-    # Add 2010-2018 census data to the dataframe.
-    df_decade = read_2010_2018_data()
-    df_pop = df_pop.append(df_decade, ignore_index=True, sort=True)
-
-    # Add 2000-2009 census data to the dataframe.
-    df_decade = read_2000_2009_data()
-    df_pop = df_pop.append(df_decade, ignore_index=True, sort=True)
-
-    # Add 1990-1999 census data to the dataframe.
-    df_decade = read_1990_1999_data()
-    df_pop = df_pop.append(df_decade, ignore_index=True, sort=True)
 
-    # Add 1900-1989 census data to the dataframe.
-    df_decade = read_1900_1989_data()
-    df_pop = df_pop.append(df_decade, ignore_index=True, sort=True)
+    # Read each range of census data and combine into one dataframe.
+    frames = [read_2010_2018_data(),
+              read_2000_2009_data(),
+              read_1990_1999_data(),
+              read_1900_1989_data()]
+    df_pop = pd.concat(frames, ignore_index=True, sort=False)
 
     #df_sum = df_pop.groupby(['year'])['population'].agg('sum')
     #df_sum.to_excel('_census_data/us_est_1900-2018_TOTALS.xlsx')
 
     (df_pop[['year', 'state','population']]
            .sort_values(by=['year', 'state'])
-           .to_excel('_census_data/us_est_1900-2018.xlsx', index=False))
+           .to_parquet('_census_data/us_est_1900-2018.parquet',
+                       engine='pyarrow', compression='zstd', index=False))
 
 if __name__ == '__main__':
     main()
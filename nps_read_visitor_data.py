@@ -1,13 +1,13 @@
 '''
 This script reads an Excel formatted report of NPS visitor data
 downloaded from nps.gov into a dataframe, reformats it so that the
-years appear as columns of visits for each park, and saves it to an
-Excel file named "annual_visitors_by_park_1904_2018.xlsx".
-Columns include: 'Park Name', and 1979 through 2018.
+years appear as columns of visits for each park, and saves it to a
+Parquet file named "annual_visitors_by_park_1904_2018.parquet".
+Columns include: 'park_name', and 1904 through 2018.
 
 Required Libraries
 ------------------
-pandas
+pandas, numpy, pyarrow, nps_shared
 
 Dependencies
 ------------
@@ -22,25 +22,34 @@ Dependencies
 '''
 
 import pandas as pd
+import numpy as np
+from nps_shared import *
 
 def main():
     infile = '_reference_data/Annual_Summary_Report_1904_Last_Calendar_Year.xlsx'
-    df = pd.read_excel(infile, header=3, index=False, usecols='A:C')
+    df = pd.read_excel(infile, header=3, usecols='A:C', engine=excel_engine)
 
     # Eliminate the summary rows found at the bottom of the file after
     # the annual park totals.
-    first_blank_row = df[pd.isnull(df.ParkName)].index.values[0]
-    df = df[:first_blank_row]
-
-    # Pivot dataframe so that the years become columns.
-    df.RecreationVisitors = df.RecreationVisitors.apply(int)
-    df = df.pivot_table('RecreationVisitors', ['ParkName'], 'Year' )
+    blank_rows = df.ParkName.isna().to_numpy()
+    if blank_rows.any():
+        df = df[:blank_rows.argmax()]
+
+    # Pivot dataframe so that the years become columns. Each park has a
+    # single row per year, so no aggregation is needed.
+    df.RecreationVisitors = df.RecreationVisitors.astype(np.int64)
+    df = df.pivot(index='ParkName', columns='Year',
+                  values='RecreationVisitors')
     df.index.rename('park_name', inplace=True)
 
     # Replace NaN with 0.0.
     df.fillna(value=0.0, inplace=True)
 
-    df.to_excel('_reference_data/annual_visitors_by_park_1904_2018.xlsx')
+    # Parquet requires string column names, so store the years as text.
+    df.columns = df.columns.astype(str)
+    df.reset_index().to_parquet(
+        '_reference_data/annual_visitors_by_park_1904_2018.parquet',
+        engine='pyarrow', compression='zstd', index=False)
 
 if __name__ == '__main__':
     main()
@@ -4,12 +4,31 @@
 
 import pandas as pd
 import argparse
-import seaborn as sns
+import matplotlib
+# Plots are only saved to files, never shown, so use the non-interactive
+# Agg backend. This must be set before pyplot is first imported.
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from cycler import cycler
+import importlib.util
+from functools import lru_cache
+from itertools import chain
+from collections import Counter
+from pathlib import Path
 
-# Use Seaborn formatting for plots and set color palette.
-sns.set()
-#sns.set_palette('Paired')
-sns.set_palette('Dark2')
+# Read Excel files with the faster calamine engine when the optional
+# python-calamine package is installed, otherwise use openpyxl, which
+# pandas opens in read-only streaming mode.
+if importlib.util.find_spec('python_calamine'):
+    excel_engine = 'calamine'
+else:
+    excel_engine = 'openpyxl'
+
+# Use Seaborn formatting for plots and set color palette. The Seaborn
+# styles ship with matplotlib, so Seaborn itself isn't imported.
+plt.style.use(['seaborn-v0_8-darkgrid', 'seaborn-v0_8-notebook'])
+#plt.rcParams['axes.prop_cycle'] = cycler(color=plt.get_cmap('Paired').colors)
+plt.rcParams['axes.prop_cycle'] = cycler(color=plt.get_cmap('Dark2').colors)
 
 us_state_code_to_name = {
     'AL': 'Alabama',
@@ -71,7 +90,7 @@ us_state_code_to_name = {
     'VI': 'U.S. Virgin Islands'
 }
 
-us_state_name_to_code = dict([[v,k] for k,v in us_state_code_to_name.items()])
+us_state_name_to_code = {v: k for k, v in us_state_code_to_name.items()}
 
 park_main_state = {
     'appa': 'WV', 'asis': 'MD', 'biso': 'TN', 'bica': 'MT', 'blrv': 'MA',
@@ -84,7 +103,124 @@ park_main_state = {
     'shil': 'TN', 'upde': 'PA', 'vick': 'MS', 'yell': 'WY'
 }
 
-def get_parks_df(warning=['None']):
+# The user can specify the set of parks to map using the command line
+# parameter, 'designation'. If no parameter specified, all park sites
+# are added to the map.
+designation_parser = argparse.ArgumentParser()
+designation_parser.add_argument('-d', '--designation', type=str,
+    help = "Set of parks for which to display locations. If not \
+            specified, all park sites will be mapped.\
+            Possible values are: 'International Historic Sites',\
+            'National Battlefields', 'National Battlefield Parks',\
+            'National Battlefield Sites', 'National Military Parks',\
+            'National Historical Parks', 'National Historic Sites',\
+            'National Lakeshores', 'National Memorials',\
+            'National Monuments', 'National Parks', 'National Parkways',\
+            'National Preserves', 'National Reserves',\
+            'National Recreation Areas', 'National Rivers',\
+            'National Wild and Scenic Rivers and Riverways',\
+            'National Scenic Trails', 'National Seashores',\
+            'Other Designations'")
+
+@lru_cache(maxsize=1)
+def parse_designation():
+    '''
+    This function parses the designation command line parameter. The
+    result is cached, so the command line is only parsed once per
+    process.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    designation : str
+      Designation command line parameter, or None if not specified.
+    '''
+
+    args = designation_parser.parse_args()
+
+    return args.designation
+
+@lru_cache(maxsize=None)
+def load_master_df(designation=None):
+    '''
+    This function reads the master dataframe. The Excel file is parsed
+    once and saved as a Parquet file next to it, with the rows sorted
+    by designation. Later runs read the Parquet file, as long as it is
+    newer than the Excel file. When a designation is given, only the
+    rows for that designation are read from the Parquet file. Results
+    are cached per designation, so scripts run in one process share
+    them.
+
+    Parameters
+    ----------
+    designation : str
+      Park designation to read, or None to read all park sites.
+
+    Returns
+    -------
+    df : Pandas dataframe
+      Master dataframe of park sites.
+    '''
+
+    xlsx_file = Path('nps_parks_master_df.xlsx')
+    parquet_file = xlsx_file.with_suffix('.parquet')
+
+    if (not parquet_file.exists()
+        or parquet_file.stat().st_mtime < xlsx_file.stat().st_mtime):
+        # Column A is the index written by nps_create_master_df.py. Text
+        # columns are typed up front to skip type inference on them.
+        # calamine returns the pre-1900 dates in this workbook as times,
+        # so it is always read with openpyxl.
+        df = pd.read_excel(xlsx_file, header=0, index_col=0,
+                           engine='openpyxl',
+                           dtype={'park_name': str, 'park_name_abbrev': str,
+                                  'park_code': str, 'designation': str,
+                                  'states': str, 'main_state': str})
+
+        # Parse the dates once here, so every reader gets datetime
+        # columns. Blank cells become NaT, and any other value that
+        # isn't a date raises rather than being dropped.
+        date_cols = ['entry_date', 'nm_date', 'np_date',
+                     'president_end_date', 'president_nm_end_date',
+                     'president_np_end_date']
+        df[date_cols] = df[date_cols].apply(pd.to_datetime)
+
+        # Small row groups of designation-sorted rows let the reader
+        # skip the groups that hold other designations. Parquet needs
+        # text column names, so the year columns are stored as text.
+        df = (df.sort_values(by='designation', kind='stable')
+                .rename(columns=str))
+        df.to_parquet(parquet_file, engine='pyarrow', compression='zstd',
+                      row_group_size=32)
+
+        # Check that the cache holds the same data as the Excel file
+        # before any script uses it. A bad cache is removed, so the
+        # next run rebuilds it.
+        try:
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(parquet_file, engine='pyarrow'), df,
+                check_dtype=False)
+        except AssertionError:
+            parquet_file.unlink()
+            raise
+
+    filters = [('designation', '==', designation)] if designation else None
+    df = pd.read_parquet(parquet_file, engine='pyarrow', filters=filters)
+    df = df.sort_index().rename(columns=lambda x: int(x) if x.isdigit() else x)
+
+    # There are only a couple dozen designations and a few dozen
+    # presidents, so store them as categories. Comparisons and
+    # grouping then work on integer codes.
+    category_cols = ['designation', 'president', 'president_nm',
+                     'president_np']
+    df = df.astype(dict.fromkeys(category_cols, 'category'))
+
+    return df
+
+def get_parks_df(warning=['None'], designation=None):
     '''
     This function is used by all the visualization scripts to read in
     the master dataframe, read the command line designation parameter,
@@ -95,6 +231,10 @@ def get_parks_df(warning=['None']):
     warning : list
       List of warnings to check dataframe for.
 
+    designation : str (optional)
+      Designation of parks to read. If not sent, the command line
+      designation parameter is used.
+
     Returns
     -------
     df_park : Pandas dataframe
@@ -104,65 +244,45 @@ def get_parks_df(warning=['None']):
       Designation command line parameter.
     '''
 
-    df = pd.read_excel('nps_parks_master_df.xlsx', header=0)
-
-    # The user can specify the set of parks to map using the command
-    # line parameter, 'designation'. If no parameter specified, all
-    # park sites are added to the map.
-    parser = argparse.ArgumentParser()
-    parser.add_argument('-d', '--designation', type=str,
-        help = "Set of parks for which to display locations. If not \
-                specified, all park sites will be mapped.\
-                Possible values are: 'International Historic Sites',\
-                'National Battlefields', 'National Battlefield Parks',\
-                'National Battlefield Sites', 'National Military Parks',\
-                'National Historical Parks', 'National Historic Sites',\
-                'National Lakeshores', 'National Memorials',\
-                'National Monuments', 'National Parks', 'National Parkways',\
-                'National Preserves', 'National Reserves',\
-                'National Recreation Areas', 'National Rivers',\
-                'National Wild and Scenic Rivers and Riverways',\
-                'National Scenic Trails', 'National Seashores',\
-                'Other Designations'")
-    args = parser.parse_args()
-
-    # Filter the dataframe based on designation and remind user which
-    # park designations will be in the visualizations.
-    if args.designation:
-        df_park = df[df.designation == args.designation]
+    # Read only the parks for the designation and remind user which
+    # park designations will be in the visualizations. Copy so that
+    # callers can't modify the cached dataframe.
+    if designation is None:
+        designation = parse_designation()
+    df_park = load_master_df(designation).copy()
+    if designation:
         print("\nCreating visualizations for the park designation, {}."
-             .format(args.designation))
-        designation = args.designation
+             .format(designation))
     else:
-        df_park = df
         print("\nCreating visualizations for all NPS sites.")
         designation = "All Parks"
 
     # Check for missing location data.
     if 'location' in warning:
-        missing_location = df_park[df_park.lat.isnull()].park_name
+        missing_location = df_park.park_name[df_park.lat.isna().to_numpy()]
         if missing_location.size:
             print("\n** Warning ** ")
             print("Park sites with missing lat/long from API, so no location "
                   "available. These park sites will not be added to maps:")
             print(*missing_location, sep=', ')
             print("** Total parks missing location: {}"
-                 .format(len(df_park[df_park.lat.isnull()].park_name)))
+                 .format(missing_location.size))
 
     # Check for missing park size data.
     if 'size' in warning:
-        missing_size = df_park[df_park.gross_area_acres.isnull()].park_name
+        missing_size = df_park.park_name[
+            df_park.gross_area_acres.isna().to_numpy()]
         if missing_size.size:
             print("\n** Warning **")
             print("Park sites not included in NPS Acreage report, so no park "
                   "size available. These park sites will not be added to the " "maps or plots:")
             print(*missing_size, sep=', ')
             print("** Total parks missing size data: {}"
-                 .format(len(missing_size)))
+                 .format(missing_size.size))
 
     # Check for missing visitor data.
     if 'visitor' in warning:
-        missing_visitor = df_park[df_park[2018].isnull()].park_name
+        missing_visitor = df_park.park_name[df_park[2018].isna().to_numpy()]
         if missing_visitor.size:
             print("\n** Warning **")
             print("Park sites not included in the NPS Visitor Use Statistics "
@@ -170,23 +290,43 @@ def get_parks_df(warning=['None']):
                   "will not be added to the map or plots:")
             print(*missing_visitor, sep=', ')
             print("** Total parks missing visit data: {}"
-                 .format(len(missing_visitor)))
+                 .format(missing_visitor.size))
 
     # Check for missing state.
     if 'state' in warning:
-        missing_state = df_park[df_park.states.isnull()].park_name
+        missing_state = df_park.park_name[df_park.states.isna().to_numpy()]
         if missing_state.size:
             print("\n** Warning ** ")
             print("Park sites with missing state from API. These park sites "
                   "will not be counted in the chloropleth maps.")
             print(*missing_state, sep=', ')
             print("Total parks missing state: {}"
-                 .format(len(df_park[df_park.states.isnull()].park_name)))
+                 .format(missing_state.size))
 
     print("")
 
     return df_park, designation
 
+def count_parks_per_state(df):
+    '''
+    This function counts the number of parks in each state. Parks in
+    more than one state are counted in each of them.
+
+    Parameters
+    ----------
+    df : Pandas DataFrame
+      DataFrame of parks with a comma separated list of states.
+
+    Returns
+    -------
+    parks_per_state : Pandas DataFrame
+      DataFrame of state code and number of parks in that state.
+    '''
+
+    state_count = Counter(chain.from_iterable(df['states'].str.split(',')))
+
+    return pd.DataFrame(state_count.items(), columns=['state', 'park_count'])
+
 def set_filename(name, type='', designation=''):
     name = (name.lower().replace(' ','_').replace(',','')
                         .replace('.','').replace('(','').replace(')',''))
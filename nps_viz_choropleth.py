@@ -8,8 +8,9 @@ The following visualizations are created:
 
 Required Libraries
 ------------------
-argparse, pandas, folium, operator, geopandas, functools, collections,
-and branca.colormap.
+argparse, json, folium, branca.colormap, and pathlib.
+geopandas is only needed if _reference_data/us-states.centroid.json
+is missing.
 
 Dependencies
 ------------
@@ -18,31 +19,55 @@ Dependencies
 '''
 
 from nps_shared import *
-import pandas as pd
+import json
 import folium
-import operator
-import geopandas as gpd
-from functools import reduce
-from collections import Counter
 from branca.colormap import LinearColormap
+from pathlib import Path
 
-def get_state_color(feature, df, color_scale):
+def get_us_centroid():
     '''
-    This function extracts the state from the GeoJson feature, finds the
-    number of parks in that state, and then returns the correct color
-    for that state using the color scale. If there are no parks in
-    the state, the color, "lightgray", is returned.
+    This function returns the center of the United States GeoJSON
+    data, the mean of the state polygon centroids. The center is
+    computed once with GeoPandas and saved to a json file next to the
+    GeoJSON file, which later calls read instead.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    center : list
+      Latitude and longitude of the center of the data.
+    '''
+
+    centroid_file = Path('_reference_data/us-states.centroid.json')
+
+    if centroid_file.exists():
+        center = json.loads(centroid_file.read_text())
+    else:
+        # GeoPandas is only needed to compute the missing file.
+        import geopandas as gpd
+        centroid = gpd.read_file('_reference_data/us-states.json').centroid
+        center = {'lat': float(centroid.y.mean()),
+                  'lon': float(centroid.x.mean())}
+        centroid_file.write_text(json.dumps(center))
+
+    return [center['lat'], center['lon']]
+
+def get_state_color(feature, state_colors):
+    '''
+    This function extracts the state from the GeoJson feature and looks
+    up the color for that state. If there are no parks in the state,
+    the color, "lightgray", is returned.
 
     Parameters
     ----------
     feature : dict
       GeoJson feature for each state in the data.
 
-    df : Pandas DataFrame
-      DataFrame of states and their park count.
-
-    color_scale : LinearColormap
-      Parks per state color scale.
+    state_colors : dict
+      Html color string for each state with parks, keyed by state code.
 
     Returns
     -------
@@ -50,13 +75,7 @@ def get_state_color(feature, df, color_scale):
       Html color string.
     '''
 
-    state = feature["properties"]["state"]
-    row = df.loc[df["state"] == state].park_count.values
-
-    if row.size > 0:
-        return color_scale(row[0])
-    else:
-        return "lightgray"
+    return state_colors.get(feature["id"], "lightgray")
 
 
 def create_state_count_choropleth(df, designation):
@@ -64,10 +83,10 @@ def create_state_count_choropleth(df, designation):
     This function counts the number of parks per state and stores the
     result in a dataframe. Then it creates a linear color map using the
     range of parks per state. The function then reads in a GeoJSON file
-    of the United States and merges this with the parks per state
-    dataframe. These objects are then used to create a choropleth map
-    of the United States with state color based on the number of parks
-    in that state. If there are no parks in a state, it will be gray.
+    of the United States and adds the park count to each state in it.
+    These objects are then used to create a choropleth map of the
+    United States with state color based on the number of parks in
+    that state. If there are no parks in a state, it will be gray.
 
     Parameters
     ----------
@@ -85,13 +104,7 @@ def create_state_count_choropleth(df, designation):
 
     # Create a two-column dataframe of state and a count of the number
     # of parks in that state.
-    state_list = df['states'].apply(lambda x: x.split(','))
-    state_list = reduce(operator.add, state_list)
-    parks_per_state = (pd.DataFrame
-                      .from_dict(Counter(state_list), orient='index')
-                      .reset_index())
-    parks_per_state = (parks_per_state
-                      .rename(columns={'index':'state', 0:'park_count'}))
+    parks_per_state = count_parks_per_state(df)
 
     # Create the color map.
     color_scale = LinearColormap(['yellow', 'green', 'blue'],
@@ -100,22 +113,34 @@ def create_state_count_choropleth(df, designation):
     color_scale.caption = ("Number of parks per state ({})"
                           .format(designation))
 
-    # Create a dataframe from the json file using GeoPandas.
-    df_geo = gpd.read_file('_reference_data/us-states.json')
-    df_geo = df_geo.merge(parks_per_state, left_on='id',
-                          right_on='state', how='left').fillna(0)
-
-    # Find the center of the data and create an empty map.
-    centroid = df_geo.geometry.centroid
-    map = folium.Map(location = [centroid.y.mean(), centroid.x.mean()],
+    # Look up each state's color once, rather than searching the
+    # dataframe for every GeoJson feature. Many states share a park
+    # count, so the color scale is only called once per count.
+    park_counts = dict(zip(parks_per_state.state,
+                           parks_per_state.park_count.tolist()))
+    count_colors = {count: color_scale(count)
+                    for count in set(park_counts.values())}
+    state_colors = {s: count_colors[count]
+                    for s, count in park_counts.items()}
+
+    # Read the GeoJSON file and add the park count to each state's
+    # properties for the tooltip.
+    with open('_reference_data/us-states.json') as f:
+        geo = json.load(f)
+    for feature in geo['features']:
+        feature['properties']['park_count'] = park_counts.get(
+            feature['id'], 0)
+
+    # Create an empty map centered on the data.
+    map = folium.Map(location = get_us_centroid(),
                      zoom_start = 3)
 
     # Color each state based on the number of parks in it.
     folium.GeoJson(
-        data = df_geo[['geometry', 'name', 'state', 'park_count']],
+        data = geo,
         name = 'United States of America',
         style_function = lambda x: {
-            'fillColor' : get_state_color(x, parks_per_state, color_scale),
+            'fillColor' : get_state_color(x, state_colors),
             'fillOpacity' : 0.7,
             'color' : 'black',
             'line_opacity' : 0.5,
@@ -134,11 +159,12 @@ def create_state_count_choropleth(df, designation):
 
     return map
 
-def main():
-    df_park, designation = get_parks_df(warning=['state'])
+def main(designation=None):
+    df_park, designation = get_parks_df(warning=['state'],
+                                        designation=designation)
 
     # Parks not missing state.
-    df_park_states = df_park[~df_park.states.isnull()]
+    df_park_states = df_park.loc[df_park.states.notna().to_numpy()]
 
     # Map #1 - Create the state park count choropleth and save to a file.
     state_map = create_state_count_choropleth(df_park_states, designation)
@@ -11,10 +11,12 @@ The following visualizations are created:
    Plot #1 - Number of parks established each decade.
    Plot #2 - Number of parks established each year.
    Plot #3 - Number of parks established by president.
+   Plot #4 - Number of parks per designation.
+   The plots are saved together as one image, date_summary.
 
 Required Libraries
 ------------------
-pandas, seaborn, matplotlib.
+pandas, numpy, matplotlib.
 
 Dependencies
 ------------
@@ -24,11 +26,34 @@ Dependencies
 
 from nps_shared import *
 import pandas as pd
-import seaborn as sns
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 
-def plot_parks_per_decade(df, designation):
+def get_entry_years(df):
+    '''
+    Extract the year each park was established from its entry date.
+    Parks without an entry date are skipped.
+
+    Parameters
+    ----------
+    df : Pandas DataFrame
+      DataFrame of park data.
+
+    Returns
+    -------
+    years : NumPy array
+      Year each park was established.
+    '''
+
+    # Casting to whole years in NumPy skips the pandas .dt accessor.
+    # Years are counted from 1970, the NumPy datetime epoch, and fit
+    # in 16 bits.
+    dates = df.entry_date.dropna().to_numpy(dtype='datetime64[ns]')
+
+    return dates.astype('datetime64[Y]').astype(np.int16) + 1970
+
+def plot_parks_per_decade(df, designation, years=None, ax=None):
     '''
     Plot parks established per decade as a bar chart.
 
@@ -40,30 +65,44 @@ def plot_parks_per_decade(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    years : NumPy array (optional)
+      Year each park was established. If not sent, it is taken from
+      the dataframe entry dates.
+
+    ax : Matplotlib Axes (optional)
+      Axes to draw the plot on. If not sent, the plot is drawn on its
+      own figure and saved to a file.
+
     Returns
     -------
     None
     '''
 
-    # Create dataframe of count of parks established per decade.
-    df['decade'] = df.entry_date.dt.year//10*10
-    decade_count = df.decade.value_counts()
+    if years is None:
+        years = get_entry_years(df)
+
+    # Count parks established per decade.
+    decades, decade_count = np.unique(years//10*10, return_counts=True)
 
     # Create bar plot of parks established per decade.
-    fig, ax = plt.subplots()
-    plt.bar(decade_count.index, decade_count.values, alpha=0.8, width=8)
-    plt.title(set_title("Number of parks established each decade", designation))
+    fig = None
+    if ax is None:
+        fig, ax = plt.subplots()
+    ax.bar(decades, decade_count, alpha=0.8, width=8)
+    ax.set_title(set_title("Number of parks established each decade",
+                           designation))
     ax.xaxis.set_major_locator(ticker.MultipleLocator(10))
-    plt.xticks(fontsize=9, rotation=90)
-    plt.ylabel('Number of parks established', fontsize=12)
-    plt.yticks(fontsize=9)
-    plt.tight_layout()
-    plt.show()
+    ax.tick_params(axis='x', labelsize=9, labelrotation=90)
+    ax.set_ylabel('Number of parks established', fontsize=12)
+    ax.tick_params(axis='y', labelsize=9)
 
-    # Save plot to file.
-    fig.savefig(set_filename('date_parks_per_decade', 'png', designation))
+    # Save plot to file, unless drawn into a shared figure.
+    if fig is not None:
+        fig.tight_layout()
+        fig.savefig(set_filename('date_parks_per_decade', 'png', designation))
+        plt.close(fig)
 
-def plot_parks_per_year(df, designation):
+def plot_parks_per_year(df, designation, years=None, ax=None):
     '''
     Plot parks established per year as a bar plot.
 
@@ -75,36 +114,83 @@ def plot_parks_per_year(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    years : NumPy array (optional)
+      Year each park was established. If not sent, it is taken from
+      the dataframe entry dates.
+
+    ax : Matplotlib Axes (optional)
+      Axes to draw the plot on. If not sent, the plot is drawn on its
+      own figure and saved to a file.
+
     Returns
     -------
     None
     '''
 
-    # Create dataframe of count of parks established per year.
-    df['year'] = df.entry_date.dt.year
-    parks_per_year = df.year.value_counts().sort_index()
-    min_year = int(df['year'].min())
-    max_year = int(df['year'].max())
-    year_count = (pd.Series(0, index=range(min_year, max_year))
-                  .to_frame()
-                  .join(parks_per_year)
-                  .fillna(0))
+    if years is None:
+        years = get_entry_years(df)
+
+    # Count parks established per year, including years with none.
+    min_year = int(years.min())
+    max_year = int(years.max()) + 1
+    year_count = np.bincount(years - min_year, minlength=max_year-min_year)
 
     # Create bar plot of parks established per year.
-    fig, ax = plt.subplots()
-    plt.bar(year_count.index, year_count.year, alpha=0.8, width=1)
-    plt.title(set_title("Number of parks established each year", designation))
+    fig = None
+    if ax is None:
+        fig, ax = plt.subplots()
+    ax.bar(np.arange(min_year, max_year), year_count, alpha=0.8, width=1)
+    ax.set_title(set_title("Number of parks established each year",
+                           designation))
     ax.xaxis.set_major_locator(ticker.MultipleLocator(10))
-    plt.xticks(rotation=90, fontsize=9)
-    plt.ylabel('Number of parks', fontsize=12)
-    plt.yticks(fontsize=9)
-    plt.tight_layout()
-    plt.show()
+    ax.tick_params(axis='x', labelsize=9, labelrotation=90)
+    ax.set_ylabel('Number of parks', fontsize=12)
+    ax.tick_params(axis='y', labelsize=9)
 
-    # Save plot to file.
-    fig.savefig(set_filename('date_parks_per_year', 'png', designation)
+    # Save plot to file, unless drawn into a shared figure.
+    if fig is not None:
+        fig.tight_layout()
+        fig.savefig(set_filename('date_parks_per_year', 'png', designation))
+        plt.close(fig)
 
-def plot_parks_per_president(df, designation):
+def count_parks_per_president(df, pres_col, end_col):
+    '''
+    Count the parks established by each president, in order of the end
+    of their term.
+
+    Parameters
+    ----------
+    df : Pandas DataFrame
+      DataFrame of park data.
+
+    pres_col : str
+      Column of the president in office when each park was established.
+
+    end_col : str
+      Column of the end date of that president's term.
+
+    Returns
+    -------
+    presidents : Pandas Index
+      President names, ordered by end of term.
+
+    park_count : NumPy array
+      Number of parks established by each president.
+    '''
+
+    # The end date only orders the presidents, so group on the
+    # president alone. Parks without a president have code -1.
+    codes, presidents = pd.factorize(df[pres_col])
+    park_count = np.bincount(codes[codes >= 0], minlength=len(presidents))
+
+    # Take each president's end date from their first park.
+    code_values, first_rows = np.unique(codes, return_index=True)
+    end_dates = df[end_col].to_numpy()[first_rows[code_values >= 0]]
+    order = np.argsort(end_dates, kind='stable')
+
+    return presidents[order], park_count[order]
+
+def plot_parks_per_president(df, designation, ax=None):
     '''
     Plot parks established per presdient as a bar plot. Park
     designations that this is possible for are: National Monuments,
@@ -118,6 +204,10 @@ def plot_parks_per_president(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    ax : Matplotlib Axes (optional)
+      Axes to draw the plot on. If not sent, the plot is drawn on its
+      own figure and saved to a file.
+
     Returns
     -------
     None
@@ -126,40 +216,35 @@ def plot_parks_per_president(df, designation):
     if designation in ["National Monuments", "National Parks", "All Parks"]:
 
         # Create bar plot of parks established per president.
-        fig = plt.figure()
+        fig = None
+        if ax is None:
+            fig, ax = plt.subplots()
 
         # If designation is National Monument, use president in office
-        # when the monument was established.
+        # when the monument was established. If designation is National
+        # Park, use president in office when the national park was
+        # established. Otherwise, use president in office when the park
+        # was originally established.
         if designation == "National Monuments":
-            pres_count = (df.groupby(['president_nm', 'president_nm_end_date'])
-                          .count().reset_index()
-                          .sort_values(by=['president_nm_end_date']))
-            plt.barh(pres_count.president_nm, pres_count.park_name)
-
-        # If designation is National Park, use president in office when
-        # the national park was established.
-        if designation == "National Parks":
-            pres_count = (df.groupby(['president_np', 'president_np_end_date'])
-                          .count().reset_index()
-                          .sort_values(by=['president_np_end_date']))
-            plt.barh(pres_count.president_np, pres_count.park_name)
-
-        # Otherwise, use president in office when the park was
-        # originally established.
-        if designation == "All Parks":
-            pres_count = (df.groupby(['president', 'president_end_date'])
-                          .count().reset_index()
-                          .sort_values(by=['president_end_date']))
-            plt.barh(pres_count.president, pres_count.park_name)
-
-        plt.title(set_title("Parks established by president", designation))
-        plt.xticks(fontsize=9)
-        plt.yticks(fontsize=9)
-        plt.tight_layout()
-        plt.show()
-
-        # Save plot to file.
-        fig.savefig(set_filename('date_parks_per_pres', 'png', designation))
+            pres_col = 'president_nm'
+        elif designation == "National Parks":
+            pres_col = 'president_np'
+        else:
+            pres_col = 'president'
+
+        presidents, park_count = count_parks_per_president(
+            df, pres_col, pres_col + '_end_date')
+        ax.barh(presidents, park_count)
+
+        ax.set_title(set_title("Parks established by president", designation))
+        ax.tick_params(labelsize=9)
+
+        # Save plot to file, unless drawn into a shared figure.
+        if fig is not None:
+            fig.tight_layout()
+            fig.savefig(set_filename('date_parks_per_pres', 'png',
+                                     designation))
+            plt.close(fig)
 
     else:
         print("\n** Warning **")
@@ -168,7 +253,7 @@ def plot_parks_per_president(df, designation):
               "not be created for the {} designation.".format(designation))
         print("****\n")
 
-def plot_parks_per_designation(df, designation):
+def plot_parks_per_designation(df, designation, ax=None):
     '''
     Plot parks per designation as a bar plot. This function does not
     really belong in this script, will move when more appropriate
@@ -182,6 +267,10 @@ def plot_parks_per_designation(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    ax : Matplotlib Axes (optional)
+      Axes to draw the plot on. If not sent, the plot is drawn on its
+      own figure and saved to a file.
+
     Returns
     -------
     None
@@ -190,26 +279,30 @@ def plot_parks_per_designation(df, designation):
     if designation in ["All Parks"]:
 
         # Create bar plot of parks per designation.
-        des_count = (df.groupby(['designation'])
+        des_count = (df.groupby(['designation'], sort=False, observed=True)
                        .count().reset_index()
                        .sort_values(by=['designation'], ascending=False))
 
-        des_count.loc[:,'designation'] = (
-            des_count.loc[:,'designation'].replace(
+        # Shorten the longest label by renaming its category, rather
+        # than rewriting every row's string.
+        des_count['designation'] = (
+            des_count.designation.cat.rename_categories(
             {'National Wild and Scenic Rivers and Riverways':
-             'Natl Wild & Scenic Rvrs and Rvrways'}, regex=True))
-
-        fig = plt.figure()
-        plt.barh(des_count.designation, des_count.park_name)
-        plt.title(set_title("Parks per designation", designation))
-        plt.xticks(fontsize=9)
-        plt.yticks(fontsize=9)
-        plt.tight_layout()
-        plt.show()
-
-        # Save plot to file.
-        fig.savefig(set_filename('date_parks_per_designation', 'png',
-                                 designation))
+             'Natl Wild & Scenic Rvrs and Rvrways'}))
+
+        fig = None
+        if ax is None:
+            fig, ax = plt.subplots()
+        ax.barh(des_count.designation, des_count.park_name)
+        ax.set_title(set_title("Parks per designation", designation))
+        ax.tick_params(labelsize=9)
+
+        # Save plot to file, unless drawn into a shared figure.
+        if fig is not None:
+            fig.tight_layout()
+            fig.savefig(set_filename('date_parks_per_designation', 'png',
+                                     designation))
+            plt.close(fig)
 
     else:
         print("\n** Warning **")
@@ -221,17 +314,34 @@ def plot_parks_per_designation(df, designation):
 def main():
     df_park, designation = get_parks_df()
 
+    # Extract the establishment years once for the decade and year
+    # plots.
+    years = get_entry_years(df_park)
+
+    # Draw all four plots on one figure, saved as a single image.
+    fig, axes = plt.subplots(2, 2, figsize=(16,12))
+
     # Plot #1 - Number of parks established each decade.
-    plot_parks_per_decade(df_park, designation)
+    plot_parks_per_decade(df_park, designation, years, ax=axes[0,0])
 
     # Plot #2 - Number of parks established each year.
-    plot_parks_per_year(df_park, designation)
+    plot_parks_per_year(df_park, designation, years, ax=axes[0,1])
 
     # Plot #3 - Number of parks established by president.
-    plot_parks_per_president(df_park, designation)
+    plot_parks_per_president(df_park, designation, ax=axes[1,0])
 
     # Plot #4 - Number of parks per designation.
-    plot_parks_per_designation(df_park, designation)
+    plot_parks_per_designation(df_park, designation, ax=axes[1,1])
+
+    # Hide the axes of plots not available for this designation.
+    for ax in axes.flat:
+        if not ax.has_data():
+            ax.set_axis_off()
+
+    # Save plot to file.
+    fig.tight_layout()
+    fig.savefig(set_filename('date_summary', 'png', designation))
+    plt.close(fig)
 #
 if __name__ == "__main__":
     main()
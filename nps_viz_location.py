@@ -8,7 +8,7 @@ specified, all NPS  site locations are added to the visualizations.
 The following visualizations are created:
 1) A Folium map with park location mapped as an icon. Each icon has as
    a clickable popup that tells the park name and links to the nps.gov
-   page for the park.
+   page for the park. Nearby icons are grouped into clusters.
    - Output file = nps_parks_map_location_{designation}.html
 
 2) Plots including:
@@ -16,7 +16,7 @@ The following visualizations are created:
 
 Required Libraries
 ------------------
-argparse, pandas, folium
+argparse, folium
 
 Dependencies
 ------------
@@ -25,13 +25,21 @@ Dependencies
 '''
 
 from nps_shared import *
-import pandas as pd
 import folium
-import operator
-import seaborn as sns
+from folium.plugins import FastMarkerCluster
 import matplotlib.pyplot as plt
-from functools import reduce
-from collections import Counter
+
+# Javascript function used by FastMarkerCluster to build each marker
+# from a row of [lat, long, popup, icon color, icon graphic].
+marker_callback = '''
+function (row) {
+    var icon = L.AwesomeMarkers.icon({
+        markerColor: row[3], prefix: 'fa', icon: row[4]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2]);
+    return marker;
+};
+'''
 
 def create_location_map(df, designation):
     '''
@@ -58,52 +66,50 @@ def create_location_map(df, designation):
                      control_scale = True,
                      tiles = 'Stamen Terrain')
 
-    # Create a dataframe of park sets with assigned icons and colors.
+    # Create a lookup of park designations with assigned icon colors
+    # and graphics.
+    designations = ['International Historic Sites',
+        'National Battlefields', 'National Battlefield Parks',
+        'National Battlefield Sites', 'National Military Parks',
+        'National Historical Parks', 'National Historic Sites',
+        'National Lakeshores', 'National Memorials', 'National Monuments',
+        'National Parks', 'National Parkways', 'National Preserves',
+        'National Reserves', 'National Recreation Areas',
+        'National Rivers',
+        'National Wild and Scenic Rivers and Riverways',
+        'National Scenic Trails', 'National Seashores',
+        'Other Designations']
     colors = ['lightgreen'] * 20
     colors[10] = 'green'
     icons = ['map-marker'] * 20
     icons[10] = 'tree'
 
-    df_icon = pd.DataFrame(
-        {'designation' : ['International Historic Sites',
-             'National Battlefields', 'National Battlefield Parks',
-             'National Battlefield Sites', 'National Military Parks',
-             'National Historical Parks', 'National Historic Sites',
-             'National Lakeshores', 'National Memorials', 'National Monuments',
-             'National Parks', 'National Parkways', 'National Preserves',
-             'National Reserves', 'National Recreation Areas',
-             'National Rivers',
-             'National Wild and Scenic Rivers and Riverways',
-             'National Scenic Trails', 'National Seashores',
-             'Other Designations'],
-         'color' : colors,
-         'icon' : icons
-        })
-
-    # Add park locations to map.
-    for _, row in (df[~df.lat.isnull()]
-        .sort_values(by='designation', ascending=False).iterrows()):
-
-        # Create popup with link to park website.
-        if ~(row.park_code[:3] == 'xxx'):
-            popup_string = ('<a href="'
-                           + 'https://www.nps.gov/' + row.park_code
-                           + '" target="_blank">'
-                           + row.park_name + '</a>').replace("'", r"\'")
-        else:
-            popup_string = row.park_name
-        popup_html = folium.Html(popup_string, script=True)
-
-        # Assign color and graphic to icon.
-        df_icon_row = df_icon[df_icon.designation == row.designation]
-        map_icon = folium.Icon(color=df_icon_row.values[0][1],
-                               prefix='fa',
-                               icon=df_icon_row.values[0][2])
-
-        # Add marker to map.
-        marker = folium.Marker(location = [row.lat, row.long],
-                               popup = folium.Popup(popup_html),
-                               icon = map_icon).add_to(map)
+    color_map = dict(zip(designations, colors))
+    icon_map = dict(zip(designations, icons))
+
+    # Collect park locations to add to the map.
+    visible = (df.dropna(subset=['lat', 'long'])
+                 .sort_values(by='designation', ascending=False))
+
+    # Create popups with link to park website.
+    popup = ('<a href="https://www.nps.gov/' + visible.park_code
+             + '" target="_blank">' + visible.park_name + '</a>')
+    popup = popup.where(visible.park_code.str[:3] != 'xxx',
+                        visible.park_name)
+
+    # Assign color and graphic to icon.
+    color = visible.designation.map(color_map)
+    icon = visible.designation.map(icon_map)
+
+    # One row per marker, zipped from the column lists rather than
+    # added to the dataframe and read back as a 2D object array.
+    data = list(zip(visible.lat.tolist(), visible.long.tolist(),
+                    popup.tolist(), color.tolist(), icon.tolist()))
+
+    # Add all markers to the map in one cluster layer. Markers are built
+    # in the browser from a single array, instead of one script block
+    # per marker.
+    FastMarkerCluster(data, callback=marker_callback).add_to(map)
 
     # Save map to file.
     map.save(set_filename('loc_map', 'html', designation))
@@ -128,31 +134,28 @@ def plot_parks_per_state(df, designation):
     '''
 
     # Create dataframe of state and count of park in each state.
-    state_list = df['states'].apply(lambda x: x.split(','))
-    state_list = reduce(operator.add, state_list)
-    parks_per_state = (pd.DataFrame
-        .from_dict(Counter(state_list), orient='index').reset_index())
-    parks_per_state = (parks_per_state
-        .rename(columns={'index':'state', 0:'park_count'}))
+    parks_per_state = count_parks_per_state(df)
     parks_per_state['state_name'] = (
-        parks_per_state.state.replace(us_state_code_to_name))
+        parks_per_state.state.map(us_state_code_to_name)
+                             .fillna(parks_per_state.state))
     parks_per_state.sort_values(by='state_name', ascending=False, inplace=True)
 
     # Horizontal bar plot of number of parks in each state.
     fig = plt.figure(figsize=(8,6))
-    plt.barh(parks_per_state.state_name, parks_per_state.park_count, alpha=0.8)
+    bars = plt.barh(parks_per_state.state_name, parks_per_state.park_count,
+                    alpha=0.8)
     plt.yticks(fontsize=8)
-    for i, v in enumerate(parks_per_state.park_count):
-        plt.text(v, i-.1, " "+str(v), color='black', va='center', fontsize=7)
+    plt.bar_label(bars, padding=2, color='black', fontsize=7)
     plt.title(set_title("Number of parks per state", designation))
     plt.tight_layout()
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('loc_parks_per_state', 'png', designation))
+    plt.close(fig)
 
-def main():
-    df_park, designation = get_parks_df(warning=['location'])
+def main(designation=None):
+    df_park, designation = get_parks_df(warning=['location'],
+                                        designation=designation)
 
     # Map #1 - Plot park locations and save map to html file.
     create_location_map(df_park, designation)
@@ -0,0 +1,54 @@
+'''
+This script runs the Folium map visualization scripts for all park
+sites and for each park designation. The command line argument,
+"designation", set by the flag, "-d", limits the run to one
+designation. The runs don't depend on each other, so they are done in
+parallel, one worker process per script and designation.
+
+The following scripts are run, for all parks and for each designation:
+1) nps_viz_choropleth.py - state park count choropleth.
+2) nps_viz_location.py - park location map and parks per state plot.
+3) nps_viz_size.py - park size map, plots, and tables.
+
+Required Libraries
+------------------
+concurrent.futures, and the libraries of the visualization scripts.
+
+Dependencies
+------------
+1) Run the script, nps_create_master_df.py to create the file,
+   nps_parks_master_df.xlsx.
+'''
+
+from nps_shared import *
+from concurrent.futures import ProcessPoolExecutor
+import nps_viz_choropleth
+import nps_viz_location
+import nps_viz_size
+
+viz_mains = [nps_viz_choropleth.main, nps_viz_location.main,
+             nps_viz_size.main]
+
+def main():
+    # Run the scripts for one designation if set on the command line.
+    # Otherwise, run them for all parks and then each designation.
+    # Reading the master dataframe here also writes its Parquet copy
+    # before the workers start, so they don't all try to create it.
+    designation = parse_designation()
+    if designation:
+        designations = [designation]
+    else:
+        designations = ([None] + load_master_df().designation
+                                 .cat.categories.tolist())
+
+    # Each run is independent CPU-bound work, so run them in separate
+    # processes. Reading the results raises any error from a worker.
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(viz_main, designation)
+                   for designation in designations
+                   for viz_main in viz_mains]
+        for future in futures:
+            future.result()
+
+if __name__ == '__main__':
+    main()
@@ -36,7 +36,12 @@ def get_park_place(parkcode, designation, df, place_type):
     else:
         sort_column = 2018
     df = df.sort_values(by=sort_column, ascending=False).reset_index(drop=True)
-    df_d = df[df.designation == designation].sort_values(by=sort_column, ascending=False).reset_index(drop=True)
+
+    # Filtering the sorted dataframe keeps its order, so the designation
+    # subset doesn't need to be sorted again. designation is categorical,
+    # so the comparison runs on its integer codes.
+    in_designation = (df.designation == designation).to_numpy()
+    df_d = df.loc[in_designation].reset_index(drop=True)
 
     overall_place = to_ord(df.loc[df.park_code == parkcode].index.values[0])
     desig_place = to_ord(df_d.loc[df_d.park_code == parkcode].index.values[0])
@@ -58,7 +63,7 @@ def main():
 
     parkcode = args.parkcode
 
-    df = pd.read_excel('nps_parks_master_df.xlsx', header=0)
+    df = load_master_df()
     park = ((df.loc[df.park_code == parkcode.lower()]
            .reset_index(drop=True))
            .loc[0])
@@ -62,27 +62,32 @@ def create_size_map(df, designation):
     None
     '''
 
-    # Create blank map.
+    # Create blank map. Park circles are drawn on one shared canvas
+    # instead of one SVG element each.
     center_lower_48 = [39.833333, -98.583333]
     map = folium.Map(location = center_lower_48,
                      zoom_start = 3,
                      control_scale = True,
-                     tiles = 'Stamen Terrain')
+                     tiles = 'Stamen Terrain',
+                     prefer_canvas = True)
 
-    # Add park size circles to map.
-    for _, row in (df[~df.lat.isnull()]
-        .sort_values(by='designation', ascending=False).iterrows()):
+    # Collect the circle data for parks with a location.
+    visible = (df.loc[df.lat.notna().to_numpy()]
+               .sort_values(by='designation', ascending=False))
+    locations = visible[['lat', 'long']].values.tolist()
+    radii = np.sqrt(visible.gross_area_square_meters/math.pi).tolist()
 
-        # Create tooltip with park size.
-        tooltip = (row.park_name.replace("'", r"\'")
-                  + ', {:,.0f} acres'.format(row.gross_area_acres)
-                  + ' ({:,.0f}'.format(row.gross_area_square_miles)
-                  + ' square miles)')
+    # Create tooltips with park size.
+    tooltips = (visible.park_name.str.replace("'", r"\'", regex=False)
+                + visible.gross_area_acres.map(', {:,.0f} acres'.format)
+                + visible.gross_area_square_miles.map(' ({:,.0f}'.format)
+                + ' square miles)').tolist()
 
-        # Add marker to map.
+    # Add park size circles to map.
+    for location, radius, tooltip in zip(locations, radii, tooltips):
         folium.Circle(
-            radius=math.sqrt(row.gross_area_square_meters/math.pi),
-            location=[row.lat, row.long],
+            radius=radius,
+            location=location,
             tooltip=tooltip,
             color='crimson',
             fill=True,
@@ -131,10 +136,10 @@ def plot_park_size_histogram(df, designation):
     plt.xlabel("Millions of acres")
     plt.ylabel("Number of parks")
     plt.title(set_title("Park size histogram 2018", designation))
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('size_histogram', 'png', designation))
+    plt.close(fig)
 
 def plot_avg_size_vs_designation(df, designation):
     '''
@@ -156,7 +161,7 @@ def plot_avg_size_vs_designation(df, designation):
 
     if designation == "All Parks":
         df = (df[['designation', 'gross_area_acres']]
-             .groupby(by='designation').mean())
+             .groupby(by='designation', observed=True).mean())
         df = df.sort_values(by='designation')
 
         # Create horizontal bar plot of number of parks in each state.
@@ -167,11 +172,11 @@ def plot_avg_size_vs_designation(df, designation):
         plt.xlabel("Millions of acres")
         plt.yticks(fontsize=8)
         plt.tight_layout()
-        plt.show()
 
         # Save plot to file.
         fig.savefig(set_filename('size_avg_size_vs_designation',
                                  'png', designation))
+        plt.close(fig)
 
     else:
         print("** Warning ** ")
@@ -207,7 +212,7 @@ def chart_total_park_area_per_state(df, designation):
 
     # Group and sum area by state.
     df_state_areas = (df[['main_state', 'gross_area_acres']]
-                      .groupby(['main_state'])
+                      .groupby(['main_state'], sort=False)
                       .sum()
                       .sort_values('gross_area_acres', ascending=False))
 
@@ -225,11 +230,11 @@ def chart_total_park_area_per_state(df, designation):
     plt.title('Total U.S. park area ({}) is {:,.0f} acres'
               .format(designation.lower(), total_area))
     plt.tight_layout(rect=[0, 0.05, 1, 0.95])
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('size_total_park_area_by_state',
                              'png', designation))
+    plt.close(fig)
 
 def plot_park_area_pct_of_state(df, designation):
     '''
@@ -257,7 +262,7 @@ def plot_park_area_pct_of_state(df, designation):
 
     # Group and sum area by state.
     df_park_area = (df[['main_state', 'gross_area_acres']]
-                    .groupby(['main_state'])
+                    .groupby(['main_state'], sort=False)
                     .sum()
                     .sort_values('gross_area_acres', ascending=False))
 
@@ -275,11 +280,11 @@ def plot_park_area_pct_of_state(df, designation):
     plt.xlabel("Percent of total state area")
     plt.yticks(fontsize=8)
     plt.tight_layout()
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('size_park_area_pct_of_state',
                              'png', designation))
+    plt.close(fig)
 
 def output_size_data_to_tables(df, designation):
     '''
@@ -318,17 +323,18 @@ def output_size_data_to_tables(df, designation):
     filename = set_filename('size_parks_sorted_by_size',
                             designation=designation)
 
-    df_export.to_excel(filename + 'xlsx', index=True)
+    df_export.to_excel(filename + 'xlsx', index=True, engine='xlsxwriter')
     df_export.to_html(filename + 'html',
                       justify='left',
                       classes='table-park-list',
                       float_format=lambda x: '{:,.0f}'.format(x))
 
-def main():
-    df_park, designation = get_parks_df(warning=['location', 'size'])
+def main(designation=None):
+    df_park, designation = get_parks_df(warning=['location', 'size'],
+                                        designation=designation)
 
     # Remove parks missing size data from the dataframe.
-    df_park = df_park[~df_park.gross_area_acres.isnull()]
+    df_park = df_park.loc[df_park.gross_area_acres.notna().to_numpy()]
 
     # Print statistical info for dataframe.
     print(df_park[['gross_area_acres', 'gross_area_square_miles',
@@ -12,12 +12,14 @@ The following visualizations are created:
 
 2) A table of park visits in order of total visits, greatest number of
    visits to smallest.
-   - Output files = visit_parks_sorted_by_visits_{designation}.xlsx,
-                    visit_parks_sorted_by_visits_{designation}.html.
+   - Output files = visit_parks_sorted_by_visits_{designation}.html,
+                    sheet "Parks by visits" of
+                    visit_tables_{designation}.xlsx.
 
 3) A table of park visits per acre in descending order.
-   - Output files = visit_park_visits_per_acre_{designation}.xlsx,
-                    visit_parks_sorted_by_visits_{designation}.html.
+   - Output files = visit_park_visits_per_acre_{designation}.html,
+                    sheet "Visits per acre" of
+                    visit_tables_{designation}.xlsx.
 
 4) Plots including:
    Plot #1 - Total visits for all parks vs. year.
@@ -29,14 +31,14 @@ The following visualizations are created:
 
 Required Libraries
 ------------------
-math, pandas, numpy, folium, matplotlib, seaborn, sklearn
+math, pandas, numpy, folium, matplotlib, sklearn, xlsxwriter
 
 Dependencies
 ------------
 1) Run the script, nps_create_master_df.py to create the file,
    nps_parks_master_df.xlsx.
 2) Run the script, nps_read_population_data.py to create the file,
-   us_est_1900-2018.xlsx.
+   us_est_1900-2018.parquet.
 '''
 
 from nps_shared import *
@@ -46,7 +48,6 @@ import numpy as np
 import folium
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import seaborn as sns
 from sklearn.linear_model import LinearRegression
 
 import warnings
@@ -72,26 +73,31 @@ def create_visitor_map(df, designation):
     None
     '''
 
-    # Create blank map.
+    # Create blank map. Vector layers are drawn on one shared canvas
+    # rather than as one SVG element per park circle.
     center_lower_48 = [39.833333, -98.583333]
     map = folium.Map(location = center_lower_48,
                      zoom_start = 3,
                      control_scale = True,
-                     tiles = 'Stamen Terrain')
+                     tiles = 'Stamen Terrain',
+                     prefer_canvas = True)
 
-    # Add park visitor circles to map.
-    for _, row in (df[~df.lat.isnull()]
-        .sort_values(by='designation', ascending=False).iterrows()):
+    # Collect the circle data for parks with a location.
+    visible = (df.loc[df.lat.notna().to_numpy()]
+               .sort_values(by='designation', ascending=False))
+    locations = visible[['lat', 'long']].values.tolist()
+    visits = visible[2018].tolist()
 
-        # Create tooltip with park visits.
-        tooltip = (row.park_name.replace("'", r"\'")
-                  + ', {:,.0f}'.format(row[2018])
-                  + " visits in 2018")
+    # Create tooltips with park visits.
+    tooltips = (visible.park_name.str.replace("'", r"\'", regex=False)
+                + visible[2018].map(', {:,.0f}'.format)
+                + " visits in 2018").tolist()
 
-        # Add marker to map.
+    # Add park visitor circles to map.
+    for location, visit_count, tooltip in zip(locations, visits, tooltips):
         folium.Circle(
-            radius=row[2018]/100,
-            location=[row.lat, row.long],
+            radius=visit_count/100,
+            location=location,
             tooltip=tooltip,
             color='blue',
             fill=True,
@@ -121,20 +127,21 @@ def plot_total_park_visits_vs_year(df, designation):
 
     # Sum park visits for each year over all parks in the dataframe.
     start_col = df.columns.tolist().index(1904)
-    df_tot = df.iloc[:, start_col:].sum()
+    years = df.columns[start_col:]
+    total_visits = np.nansum(df[years].to_numpy(dtype=float), axis=0)
 
     # Plot total park visits vs. year as a line plot.
     fig, ax = plt.subplots()
-    ax.plot(df_tot.index, df_tot.values/1e6)
+    ax.plot(years, total_visits/1e6)
     ax.xaxis.set_major_locator(ticker.MultipleLocator(10))
     plt.xticks(rotation=90)
     plt.ylabel("Millions of visits")
     plt.title(set_title("Total park visits, 1904-2018", designation))
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_total_park_visits_vs_year', 'png',
                              designation))
+    plt.close(fig)
 
 def plot_total_park_visit_change_rate_vs_year(df, designation):
     '''
@@ -158,15 +165,15 @@ def plot_total_park_visit_change_rate_vs_year(df, designation):
 
     # Sum park visits for each year over all parks in the dataframe.
     start_col = df.columns.tolist().index(1904)
-    df_tot = df.iloc[:, start_col:].sum().to_list()
-    change_rate, change_pct = [], []
+    total_visits = np.nansum(df.iloc[:, start_col:].to_numpy(dtype=float),
+                             axis=0)
 
     # Calculate change rate for each year compared to the prior year
     # as a difference in total visists and as a percent.
-    for i, tot in enumerate(df_tot):
-        if i > 0:
-            change_rate.append((df_tot[i] - df_tot[i-1])/1e6)
-            change_pct.append((df_tot[i] - df_tot[i-1])/df_tot[i-1])
+    change = np.diff(total_visits)
+    change_rate = change/1e6
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = change/total_visits[:-1]
 
     # Plot change rate as number of visits vs. year.
     fig, ax = plt.subplots()
@@ -176,10 +183,10 @@ def plot_total_park_visit_change_rate_vs_year(df, designation):
     plt.ylabel("Change rate (millions of visits)")
     plt.title(set_title("Visit change rate, year to prior year, 1905-2018",
                         designation))
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_change_rate_vs_year', 'png', designation))
+    plt.close(fig)
 
     # Plot change rate as a percent of prior year visits vs. year.
     fig, ax = plt.subplots()
@@ -189,10 +196,10 @@ def plot_total_park_visit_change_rate_vs_year(df, designation):
     plt.ylabel("Change percent")
     plt.title(set_title("Visit change percent, year to prior year, 1905-2018",
                         designation))
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_change_pct_vs_year', 'png', designation))
+    plt.close(fig)
 
 def plot_total_estimated_park_visits_vs_year(df, designation):
     '''
@@ -244,11 +251,11 @@ def plot_total_estimated_park_visits_vs_year(df, designation):
         ax.set_ylim(0,500)
 
     plt.tight_layout()
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_total_estimated_park_visits_vs_year',
                              'png', designation))
+    plt.close(fig)
 
 def plot_park_visits_vs_year(df, designation, title=None):
     '''
@@ -300,10 +307,10 @@ def plot_park_visits_vs_year(df, designation, title=None):
     ax.xaxis.set_major_locator(ticker.MultipleLocator(10))
     plt.xticks(rotation=90)
     plt.ylabel('Millions of visits')
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_' + title, 'png', designation))
+    plt.close(fig)
 
 def plot_park_visits_histogram(df, designation):
     '''
@@ -346,10 +353,10 @@ def plot_park_visits_histogram(df, designation):
     plt.ylabel("Number of parks")
     plt.title(set_title("Number of park visits in 2018", designation))
     plt.tight_layout()
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visit_histogram', 'png', designation))
+    plt.close(fig)
 
 def plot_park_visits_per_acre_histogram(df, designation):
     '''
@@ -396,15 +403,15 @@ def plot_park_visits_per_acre_histogram(df, designation):
     plt.suptitle(set_title("      Number of park visits per acre in 2018", designation))
     plt.title("Gateway Arch NP is not included because it is such an extreme outlier.", size=10)
     plt.tight_layout(rect=[0, 0.02, 1, 0.98])
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('visits_per_acre_histogram', 'png', designation))
+    plt.close(fig)
 
-def output_park_visits_per_acre(df, designation):
+def output_park_visits_per_acre(df, designation, writer):
     '''
     This function outputs the park visits per acre data as a table
-    to both an Excel spreadsheet and an html file. The data is sorted
+    to both an Excel worksheet and an html file. The data is sorted
     by number of visits, largest first.
 
     Parameters
@@ -415,6 +422,9 @@ def output_park_visits_per_acre(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    writer : Pandas ExcelWriter
+      Open Excel workbook to add the table to.
+
     Returns
     -------
     None
@@ -438,14 +448,14 @@ def output_park_visits_per_acre(df, designation):
 
     filename = set_filename('visit_park_visits_per_acre', designation=designation)
 
-    df_export.to_excel(filename + 'xlsx', index=True)
+    df_export.to_excel(writer, sheet_name='Visits per acre', index=True)
     df_export.to_html(filename + 'html', justify='left',
         classes='table-park-list', float_format=lambda x: '{:,.0f}'.format(x))
 
-def output_visit_data_to_tables(df, designation):
+def output_visit_data_to_tables(df, designation, writer):
     '''
     This function outputs the park visit data as a table to both an
-    Excel spreadsheet and an html file. The data is sorted by number of
+    Excel worksheet and an html file. The data is sorted by number of
     visits, largest first.
 
     Parameters
@@ -456,6 +466,9 @@ def output_visit_data_to_tables(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    writer : Pandas ExcelWriter
+      Open Excel workbook to add the tables to.
+
     Returns
     -------
     None
@@ -471,7 +484,7 @@ def output_visit_data_to_tables(df, designation):
 
     filename = set_filename('visit_parks_sorted_by_visits', designation=designation)
 
-    df_export.to_excel(filename + 'xlsx', index=True)
+    df_export.to_excel(writer, sheet_name='Parks by visits', index=True)
     df_export.to_html(filename + 'html', justify='left',
         classes='table-park-list', float_format=lambda x: '{:,.0f}'.format(x))
 
@@ -480,14 +493,15 @@ def output_visit_data_to_tables(df, designation):
 
     filename = set_filename('visit_parks_sorted_by_visits_top_10', designation=designation)
 
-    df_export_top_10.to_excel(filename + 'xlsx', index=True)
+    df_export_top_10.to_excel(writer, sheet_name='Top 10 parks by visits',
+                              index=True)
     df_export_top_10.to_html(filename + 'html', justify='left',
         classes='table-park-list', float_format=lambda x: '{:,.0f}'.format(x))
 
-def output_total_visit_data_to_tables(df, designation):
+def output_total_visit_data_to_tables(df, designation, writer):
     '''
     This function outputs the total park visit data by year as a
-    table to both an Excel spreadsheet and an html file. The data is
+    table to both an Excel worksheet and an html file. The data is
     sorted by year.
 
     Parameters
@@ -498,6 +512,9 @@ def output_total_visit_data_to_tables(df, designation):
     designation : str
       Designation of parks in the dataframe.
 
+    writer : Pandas ExcelWriter
+      Open Excel workbook to add the table to.
+
     Returns
     -------
     None
@@ -510,7 +527,7 @@ def output_total_visit_data_to_tables(df, designation):
 
     filename = set_filename('visit_total_park_visits_by_year', designation=designation)
 
-    df_export.to_excel(filename + 'xlsx', index=True,
+    df_export.to_excel(writer, sheet_name='Total visits by year', index=True,
         index_label='Year', float_format='%.2f')
     df_export.to_html(filename + 'html', justify='left', index=True,
         classes='table-park-list', float_format=lambda x: '{:,.0f}'.format(x))
@@ -519,8 +536,9 @@ def main():
     df_park, designation = get_parks_df(warning=['location', 'visitor'])
 
     # Parks with visitors recorded in 2018.
-    df_2018 = df_park[~df_park[2018].isnull()]
-    df_2018 = df_2018[df_2018[2018] > 0.0]
+    # Parks with no 2018 data compare as False, so one mask drops both
+    # the missing and the zero visit counts.
+    df_2018 = df_park.loc[df_park[2018].to_numpy() > 0.0]
     df_2018 = df_2018.sort_values(by=[2018], ascending=False)
 
     # Print statistical info for dataframe.
@@ -556,14 +574,19 @@ def main():
     # Plot #6 - Park visits per acre histogram.
     plot_park_visits_per_acre_histogram(df_park, designation)
 
-    # Save park visits per acre table.
-    output_park_visits_per_acre(df_park, designation)
+    # Save the tables as html files and as sheets of one Excel workbook,
+    # so the workbook is only assembled and compressed once.
+    with pd.ExcelWriter(set_filename('visit_tables', 'xlsx', designation),
+                        engine='xlsxwriter') as writer:
+
+        # Save park visits per acre table.
+        output_park_visits_per_acre(df_park, designation, writer)
 
-    # Save park visit data.
-    output_visit_data_to_tables(df_2018, designation)
+        # Save park visit data.
+        output_visit_data_to_tables(df_2018, designation, writer)
 
-    # Save total park visit data by year.
-    output_total_visit_data_to_tables(df_park, designation)
+        # Save total park visit data by year.
+        output_total_visit_data_to_tables(df_park, designation, writer)
 
 if __name__ == '__main__':
     main()
@@ -14,14 +14,14 @@ The following visualizations are created:
 
 Required Libraries
 ------------------
-nps_shared, pandas, numpy, matplotlib, scipy
+nps_shared, pandas, pyarrow, numpy, matplotlib, scipy
 
 Dependencies
 ------------
 1) Run the script, nps_create_master_df.py to create the file,
    nps_parks_master_df.xlsx.
 2) Run the script, nps_read_population_data.py to create the file,
-   us_est_1900-2018.xlsx.
+   us_est_1900-2018.parquet.
 '''
 
 from nps_shared import *
@@ -33,10 +33,11 @@ from scipy.stats import linregress
 
 def read_census_data():
     '''
-    Read census population data from the Excel file,
-    us_est_1900-2018.xlsx, created by the script,
+    Read census population data from the Parquet file,
+    us_est_1900-2018.parquet, created by the script,
     nps_read_population_data.py, into a dataframe to be used for
-    plotting.
+    plotting. If the Parquet file is missing, the Excel copy included
+    in the repository, us_est_1900-2018.xlsx, is read instead.
 
     Parameters
     ----------
@@ -48,9 +49,12 @@ def read_census_data():
       DataFrame of U.S. population by year and state (when available)
     '''
 
-    df_pop = pd.read_excel(
-             '_census_data/us_est_1900-2018.xlsx',
-              header=0, index=False)
+    filename = Path('_census_data/us_est_1900-2018.parquet')
+    if filename.exists():
+        df_pop = pd.read_parquet(filename, engine='pyarrow')
+    else:
+        df_pop = pd.read_excel(filename.with_suffix('.xlsx'), header=0,
+                               engine=excel_engine)
     df_pop = df_pop.groupby('year').sum()
 
     return df_pop
@@ -88,11 +92,11 @@ def park_visits_and_us_pop_vs_year(df_tot, df_pop, designation):
     ax[1].set_title("U.S. population" )
     ax[1].set_ylabel("Millions of people")
     ax[1].set_ylim(bottom=0, top=350)
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('census_park_visits_vs_us_pop',
                              'png', designation))
+    plt.close(fig)
 
 def total_park_visits_per_cap_vs_year(df_tot, df_pop, designation, title=""):
     '''
@@ -185,10 +189,10 @@ def total_park_visits_per_cap_vs_year(df_tot, df_pop, designation, title=""):
 
     plt.title(title)
     fig.tight_layout()
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('census_' + title, 'png'))
+    plt.close(fig)
 
 def total_park_visits_per_cap_vs_year_4(df_parks, df_pop):
     '''
@@ -268,10 +272,10 @@ def total_park_visits_per_cap_vs_year_4(df_parks, df_pop):
     fig.text(0.03, 0.5, 'Per capita visits', ha='center', va='center',
              rotation='vertical')
 
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('census_' + title, 'png'))
+    plt.close(fig)
 
 def park_visits_per_cap_vs_change_rate_quad(df_park, df_pop, designation):
     '''
@@ -295,39 +299,41 @@ def park_visits_per_cap_vs_change_rate_quad(df_park, df_pop, designation):
     None
     '''
 
-    df = pd.DataFrame(columns=['park_name', 'per_capita_mean', 'change_rate'])
+    # Per capita visits for each park (row) and year (column).
+    start_col = df_park.columns.tolist().index(1904)
+    years = df_park.columns[start_col:].to_numpy(dtype=int)
+    visits = np.nan_to_num(df_park.iloc[:, start_col:].to_numpy(dtype=float))
+    visits_div_pop = visits / df_pop.population.reindex(years).to_numpy()
+
+    # Use the years since 1967, or since the last year the park had no
+    # visits if that is later.
+    first_dec_yr = 1967
+    no_visits = visits_div_pop == 0.0
+    last_zero_yr = years[-1 - np.argmax(no_visits[:, ::-1], axis=1)]
+    first_positive_yr = np.where(no_visits.any(axis=1), last_zero_yr + 1, 1904)
+    start_year = np.maximum(first_dec_yr, first_positive_yr)
+    in_range = years >= start_year[:, np.newaxis]
+    year_count = in_range.sum(axis=1)
+
+    # Calculate average per capita visits from 1967  to 2018.
+    per_capita_mean = (np.where(in_range, visits_div_pop, 0.0).sum(axis=1)
+                       / year_count)
+
+    # Fit a regression line to the per capita visits vs. year and find
+    # the slope (change rate in per captia visits over time), as a
+    # least squares fit over each park's years.
+    year_mean = np.where(in_range, years, 0).sum(axis=1) / year_count
+    dx = np.where(in_range, years - year_mean[:, np.newaxis], 0.0)
+    dy = np.where(in_range, visits_div_pop - per_capita_mean[:, np.newaxis],
+                  0.0)
+    change_rate = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
 
     # Create a dataframe with row for each park with mean per capita
     # visits since 1967 and change rate in per capita visits since 1967.
-    for _, row in df_park.iterrows():
-        # Format dataframe and caluculate per capita visits per year.
-        df_row = row.to_frame().T
-        df_tot = get_visit_df(df_row)
-        df_tot['visits_div_pop'] = df_tot.total_visits / df_pop.population
-
-        first_dec_yr = 1967
-        first_positive_yr = 1904
-        df_tot_zero = df_tot[df_tot.visits_div_pop == 0.0]
-        if len(df_tot_zero) > 0:
-            first_positive_yr = df_tot_zero.index[-1] + 1
-        start_year = max(first_dec_yr, first_positive_yr)
-        df_dec = df_tot.loc[start_year:]
-
-        # Calculate average per capita visits from 1967  to 2018.
-        per_capita_mean = df_dec.mean().visits_div_pop
-
-        # Fit a regression line to the per capita visits vs. year and
-        # find the slope (change rate in per captia visits over time).
-        regress_x = df_dec.index
-        regress_y = df_dec.visits_div_pop
-        stats = linregress(regress_x, regress_y)
-        m = stats.slope
-
-        # Add park row to dataframe.
-        df = df.append({'park_name' : row.park_name,
-                        'park_code' : row.park_code,
-                        'per_capita_mean' : per_capita_mean,
-                        'change_rate' : m}, ignore_index=True)
+    df = pd.DataFrame({'park_name': df_park.park_name.to_numpy(),
+                       'park_code': df_park.park_code.to_numpy(),
+                       'per_capita_mean': per_capita_mean,
+                       'change_rate': change_rate})
 
     # Divide quadrants vertically by average of visits per capita.
     mean_per_capita_mean = df.per_capita_mean.mean()
@@ -417,11 +423,11 @@ def park_visits_per_cap_vs_change_rate_quad(df_park, df_pop, designation):
     plt.ylabel('Visits per capita change rate', size=10)
     ax.tick_params(labelsize=8)
     plt.title(set_title("Park popularity quadrant", designation))
-    plt.show()
 
     # Save plot to file.
     fig.savefig(set_filename('census_park_popularity_quadrant',
                              'png', designation))
+    plt.close(fig)
 
 def get_visit_df(df):
     '''